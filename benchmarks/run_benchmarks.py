@@ -0,0 +1,221 @@
+'''
+Offline benchmark suite for pyplotbrookings.
+
+Measures wall time and peak (Python) memory of the theme, palette, layout, 
+logo, and save helpers. Results are written as JSON and can be compared to 
+a stored baseline to catch performance regressions:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+
+Peak memory is measured with tracemalloc, so it covers allocations made 
+through Python and NumPy but not memory held by matplotlib's C++ renderer.
+'''
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import pyplotbrookings.pyplotbrookings as ppb
+
+
+def _plot_figure(size='medium'):
+    '''
+    Creates a simple line chart to add titles, notes, and logos to
+    '''
+    fig = ppb.figure(size)
+    plt.plot([0, 1, 2, 3, 4], [3, 1, 4, 1, 5], label='Series')
+    plt.xlabel('X label')
+    return fig
+
+
+def _titled_figure(size='medium'):
+    '''
+    Creates a chart with titles, notes, and a logo (ready to be saved)
+    '''
+    fig = _plot_figure(size)
+    ppb.add_title(title='Benchmark title', subtitle='A longer benchmark subtitle', 
+                  tag='FIGURE 1')
+    ppb.add_notes('Source: Benchmark data', 'Notes: Made with pyplotbrookings')
+    ppb.add_logo('brookings')
+    return fig
+
+
+def _cases():
+    '''
+    Yields (name, setup, run) benchmark cases. setup() returns the argument
+    passed to run(), only run() is timed.
+    '''
+    yield 'set_theme', None, lambda _: ppb.set_theme()
+    yield 'get_palette', None, lambda _: ppb.get_palette('vivid blue')
+    yield 'get_color', None, lambda _: ppb.get_color('orange 50')
+    yield 'get_cmap', None, lambda _: ppb.get_cmap('sequential (two hues)')
+    yield 'add_title', _plot_figure, lambda _: ppb.add_title(
+        title='Benchmark title', subtitle='A longer benchmark subtitle', tag='FIGURE 1')
+
+    for n in (1, 5, 10, 20):
+        notes = ['Note %d: benchmark note text' % i for i in range(n)]
+        yield 'add_notes[%d]' % n, _plot_figure, lambda _, notes=notes: ppb.add_notes(*notes)
+
+    yield 'add_logo', _plot_figure, lambda _: ppb.add_logo('brookings')
+
+    for size in ('small', 'medium', 'large'):
+        for dpi in ('screen', 'print', 'retina'):
+            yield ('save[%s-%s]' % (size, dpi), lambda size=size: _titled_figure(size),
+                   lambda _, dpi=dpi: ppb.save(io.BytesIO(), dpi=dpi, format='png'))
+
+
+# Measures a cold import in a fresh interpreter (printed as JSON)
+_IMPORT_SCRIPT = '''
+import json, sys, time, tracemalloc
+tracemalloc.start()
+start = time.perf_counter()
+import pyplotbrookings.pyplotbrookings as ppb
+ppb.get_color('orange 50')
+elapsed = time.perf_counter() - start
+print(json.dumps({'time': elapsed, 'peak': tracemalloc.get_traced_memory()[1],
+                  'matplotlib': 'matplotlib' in sys.modules}))
+'''
+
+
+def run_import(repeat=5):
+    '''
+    Benchmarks importing the package and looking up a color in fresh 
+    interpreters (the cold start cost for code that only needs colors)
+    '''
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', _IMPORT_SCRIPT], check=True,
+                                capture_output=True, text=True).stdout
+        runs.append(json.loads(output))
+
+    times = [r['time'] for r in runs]
+    return {'min': min(times), 
+            'median': statistics.median(times),
+            'peak_memory_kb': max(r['peak'] for r in runs) / 1024,
+            'imports_matplotlib': any(r['matplotlib'] for r in runs)}
+
+
+def run(repeat=5, select=None):
+    '''
+    Runs the benchmark cases and returns a dictionary of results
+
+    repeat (int): Number of timed runs per case
+
+    select (str): Only run cases whose name contains this string
+    '''
+    results = {}
+    if not select or select in 'import':
+        try:
+            results['import'] = run_import(repeat)
+        except (subprocess.CalledProcessError, ValueError) as e:
+            results['import'] = {'error': f'{type(e).__name__}: {e}'}
+
+    ppb.set_theme()
+
+    for name, setup, func in _cases():
+        if select and select not in name:
+            continue
+
+        times = []
+        try:
+            for _ in range(repeat):
+                arg = setup() if setup else None
+                start = time.perf_counter()
+                func(arg)
+                times.append(time.perf_counter() - start)
+                plt.close('all')
+
+            # Memory is traced in a separate run (tracing slows down timing)
+            arg = setup() if setup else None
+            tracemalloc.start()
+            func(arg)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            plt.close('all')
+
+        except Exception as e:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            plt.close('all')
+            results[name] = {'error': f'{type(e).__name__}: {e}'}
+            continue
+
+        results[name] = {'min': min(times), 
+                         'median': statistics.median(times),
+                         'peak_memory_kb': peak / 1024}
+    return results
+
+
+def compare(results, baseline, threshold=1.25):
+    '''
+    Compares results to a baseline and returns a list of regressions (cases
+    whose median time or peak memory grew by more than the threshold ratio)
+    '''
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or 'error' in base or 'error' in result:
+            continue
+
+        for metric in ('median', 'peak_memory_kb'):
+            if base[metric] > 0 and result[metric] / base[metric] > threshold:
+                regressions.append((name, metric, base[metric], result[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case')
+    parser.add_argument('--select', help='only run cases containing this string')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--save-baseline', help='write results as a new baseline file')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25, 
+                        help='slowdown ratio reported as a regression')
+    args = parser.parse_args(argv)
+
+    report = {
+        'meta': {'python': platform.python_version(), 
+                 'matplotlib': matplotlib.__version__,
+                 'pyplotbrookings': ppb._package_version(),
+                 'platform': platform.platform()},
+        'results': run(args.repeat, args.select),
+    }
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+
+    # Human readable summary
+    for name, result in report['results'].items():
+        if 'error' in result:
+            print(f'{name:<26} ERROR {result["error"]}')
+        else:
+            print(f'{name:<26} {result["median"]*1000:9.2f} ms {result["peak_memory_kb"]:10.1f} KiB')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+        regressions = compare(report['results'], baseline, args.threshold)
+        for name, metric, before, after in regressions:
+            print(f'REGRESSION {name} {metric}: {before:.4g} -> {after:.4g}')
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
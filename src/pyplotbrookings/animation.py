@@ -0,0 +1,189 @@
+'''
+Animated Brookings charts saved as GIFs or PNG frame sequences.
+
+The titles, notes, logo, and axes are drawn once by a figure template (see
+templates.FigureTemplate) and each frame only draws the data. Frames are
+encoded and written as they are drawn, so memory use doesn't grow with the
+number of frames:
+
+    import pyplotbrookings.animation as ppb_animation
+    import pyplotbrookings.templates as ppb_templates
+
+    template = ppb_templates.FigureTemplate(title='Unemployment rate',
+                                            xlim=(0, 120), ylim=(0, 15))
+
+    def init(ax):
+        return ax.plot([], [])[0]
+
+    def update(line, month):
+        line.set_data(months[:month], rates[:month])
+
+    ppb_animation.animate(template, update, range(120), 'unemployment.gif',
+                          init=init, fps=12)
+
+Frames can also be saved as PNG files ('frames/{:04d}.png') and encoded
+in parallel across worker processes (processes=4).
+'''
+from collections import deque
+import io
+import os
+
+import numpy as np
+
+
+def animate(template, update, frames, filename=None, init=None, fps=10, loop=0,
+            processes=None):
+    '''
+    Draws and saves an animation frame by frame. Returns the path (or the
+    GIF as bytes if filename is None), or the list of paths of a PNG
+    sequence.
+
+    template (FigureTemplate): Template with the static parts of the chart
+
+    update (callable): Function drawing a frame. Called with the value
+        returned by init and the frame (e.g., update(line, frame)). Without
+        init it is called with the axis (or array of axes) and the artists
+        it adds are removed after each frame.
+
+    frames (iterable): Frame values passed to update (e.g., range(100))
+
+    filename (str): A '.gif' path, or a format pattern of PNG frame paths
+        (e.g., 'frames/{:04d}.png'). If None the GIF is returned as bytes.
+
+    init (callable): Optional function creating the animated artists once,
+        called with the axis (or array of axes). Its return value is passed
+        to update, which then only changes the artists (e.g., with set_data).
+
+    fps (float): Frames per second of GIFs
+
+    loop (int): Number of times GIFs repeat (0 repeats forever, None plays
+        once)
+
+    processes (int): Number of worker processes encoding frames (frames are
+        encoded in the main process if None)
+    '''
+    sequence = filename is not None and '{' in str(filename)
+    if sequence:
+        writer = _PngSequence(filename)
+    elif filename is None or str(filename).lower().endswith('.gif'):
+        writer = _GifStream(filename, duration=1000 / fps, loop=loop)
+    else:
+        raise Exception("Animations are saved as a '.gif' file or a PNG sequence pattern (e.g., 'frames/{:04d}.png')")
+
+    state = init(template.axes) if init is not None else None
+    pool = None
+    if processes:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=processes)
+
+    # Encoded frames waiting to be written (bounded so memory doesn't grow)
+    pending = deque()
+    try:
+        for index, frame in enumerate(frames):
+            if init is None:
+                image = template.render_rgba(lambda axes: update(axes, frame))
+            else:
+                update(state, frame)
+                image = template._draw_data()
+
+            job = writer.job(index, image)
+            if pool is None:
+                writer.write(job[0](*job[1:]))
+                continue
+
+            pending.append(pool.submit(*job))
+            if len(pending) >= 2 * processes:
+                writer.write(pending.popleft().result())
+
+        while pending:
+            writer.write(pending.popleft().result())
+
+    finally:
+        if pool is not None:
+            # Frames not encoded yet are dropped (shutdown(cancel_futures=True)
+            # needs Python 3.9)
+            for future in pending:
+                future.cancel()
+            pool.shutdown()
+        if init is not None:
+            template._clear()
+
+    return writer.close()
+
+
+class _PngSequence:
+    '''
+    Writes frames as numbered PNG files
+    '''
+    def __init__(self, pattern):
+        self.pattern = str(pattern)
+        self.paths = []
+
+    def job(self, index, image):
+        path = self.pattern.format(index)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return (_encode_png, image, path)
+
+    def write(self, path):
+        self.paths.append(path)
+
+    def close(self):
+        return self.paths
+
+
+class _GifStream:
+    '''
+    Writes GIF frames as they are encoded (every frame has its own palette)
+    '''
+    def __init__(self, filename, duration, loop):
+        self.filename = filename
+        self.duration = duration
+        self.loop = loop
+        self.file = io.BytesIO() if filename is None else open(filename, 'wb')
+
+    def job(self, index, image):
+        return (_encode_gif_frame, image, self.duration, index == 0, self.loop)
+
+    def write(self, chunks):
+        self.file.writelines(chunks)
+
+    def close(self):
+        self.file.write(b';')
+        if self.filename is None:
+            return self.file.getvalue()
+        self.file.close()
+        return self.filename
+
+
+def _encode_png(image, path):
+    '''
+    Saves an RGBA image array as a PNG file, returns the path
+    '''
+    from PIL import Image
+
+    Image.fromarray(image, 'RGBA').save(path, format='PNG')
+    return path
+
+
+def _encode_gif_frame(image, duration, first=False, loop=0):
+    '''
+    Encodes an RGBA image array as a GIF frame with its own palette, returns
+    the list of encoded chunks (starting with the GIF header for the first 
+    frame)
+    '''
+    from PIL import Image, GifImagePlugin
+
+    # GIFs have no partial transparency, composite onto a white background
+    alpha = image[..., 3:].astype(np.uint16)
+    rgb = ((image[..., :3] * alpha + 255 * (255 - alpha) + 127) // 255).astype(np.uint8)
+    frame = Image.fromarray(rgb, 'RGB').quantize(256, method=Image.Quantize.FASTOCTREE)
+
+    chunks = []
+    if first:
+        header, _ = GifImagePlugin.getheader(frame, info={'loop': loop, 'duration': duration})
+        chunks.extend(header)
+
+    chunks.extend(GifImagePlugin.getdata(frame, duration=duration, include_color_table=True))
+    return chunks
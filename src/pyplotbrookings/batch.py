@@ -0,0 +1,204 @@
+'''
+Batch rendering of Brookings styled charts across a pool of worker processes.
+
+Each worker is set up once (theme, fonts, and logos) and then renders charts
+from ChartSpec objects. Results are streamed back as charts finish:
+
+    import pyplotbrookings.batch as ppb_batch
+
+    def plot_unemployment(ax):
+        ax.plot(...)
+
+    specs = [ppb_batch.ChartSpec(plot_unemployment, 'unemployment.png', 
+                                 title='Unemployment', logo='hc')]
+
+    for result in ppb_batch.render_batch(specs, processes=4):
+        if result.error:
+            print(result.index, result.error)
+'''
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+import importlib
+import io
+import signal
+import time
+import traceback
+
+from . import pyplotbrookings as ppb
+
+
+@dataclass
+class ChartSpec:
+    '''
+    Description of a single chart to render.
+
+    plot (callable): Function drawing the chart data given a matplotlib axis,
+        plot(ax). It must be picklable (e.g., a module level function).
+
+    filename (str): Output path. If None the chart is returned as bytes.
+
+    title, subtitle, tag (str): Chart titles (see add_title)
+
+    notes (tuple): Chart notes (see add_notes)
+
+    logo (str): Logo path or abbreviation of a supported logo (see add_logo)
+
+    size (str or tuple): Brookings figure size (small, medium, large) or a
+        (width, height) tuple in inches
+
+    dpi (str or float): Brookings DPI (retina, print, screen) or a number
+
+    format (str): Output format (e.g., 'png' or 'svg'). Inferred from the 
+        filename if not given, otherwise defaults to png.
+
+    timeout (float): Seconds the chart may take before it is cancelled
+        (overrides the render_batch timeout)
+    '''
+    plot: object
+    filename: str = None
+    title: str = None
+    subtitle: str = None
+    tag: str = None
+    notes: tuple = ()
+    logo: str = None
+    size: object = 'medium'
+    dpi: object = 'screen'
+    format: str = None
+    timeout: float = None
+
+
+@dataclass
+class ChartResult:
+    '''
+    Outcome of rendering a ChartSpec.
+
+    index (int): Position of the spec in the list given to render_batch
+
+    filename (str): Path the chart was saved to (None for in-memory charts)
+
+    data (bytes): The rendered chart if no filename was given
+
+    error (str): Formatted traceback if rendering failed, otherwise None
+
+    elapsed (float): Seconds spent rendering the chart in the worker
+    '''
+    index: int
+    filename: str = None
+    data: bytes = None
+    error: str = None
+    elapsed: float = 0.0
+
+
+def render_batch(specs, processes=None, theme=None, timeout=None):
+    '''
+    Renders charts in parallel and yields a ChartResult for each one as it
+    finishes (not necessarily in order, use ChartResult.index). Errors in 
+    one chart do not stop the batch, they are reported in ChartResult.error.
+
+    specs (list): ChartSpec objects to render
+
+    processes (int): Number of worker processes (defaults to the CPU count)
+
+    theme (dict): Keyword arguments for set_theme() used by every worker
+
+    timeout (float): Seconds each chart may take before it is cancelled.
+        Timeouts are enforced with timer signals, which are only available 
+        on POSIX systems.
+    '''
+    specs = list(specs)
+    # Load the plotting modules up front (forked workers inherit them)
+    for module in ('.theme', '.plotting'):
+        importlib.import_module(module, __package__)
+    # Only decode the logos that are used by this batch
+    logos = sorted({spec.logo for spec in specs if spec.logo})
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(theme or {}, logos)) as pool:
+        futures = {pool.submit(_render_chart, i, spec, timeout): i
+                   for i, spec in enumerate(specs)}
+
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception:
+                # Specs that can't be pickled or crashed workers only fail
+                # their own charts
+                index = futures[future]
+                yield ChartResult(index, filename=specs[index].filename,
+                                  error=traceback.format_exc())
+
+
+def _init_worker(theme, logos):
+    '''
+    Sets up a worker process: headless backend, theme, fonts, and logos
+    '''
+    import matplotlib
+    matplotlib.use('Agg')
+
+    ppb.set_theme(**theme)
+
+    # Decode the logos once so charts only pay for placing them
+    for logo in logos:
+        fig = ppb.figure('small')
+        try:
+            ppb.add_logo(logo)
+        except Exception:
+            # Missing logos are reported by the charts using them
+            pass
+        ppb.plt.close(fig)
+
+
+def _render_chart(index, spec, timeout):
+    '''
+    Renders a single chart in a worker process
+    '''
+    timeout = spec.timeout or timeout
+    start = time.perf_counter()
+    fig = None
+
+    # Cancel the chart with a timer signal when it takes too long
+    use_timer = bool(timeout) and hasattr(signal, 'setitimer')
+    if use_timer:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        fig = ppb.figure(spec.size)
+        ax = fig.add_subplot()
+        spec.plot(ax)
+
+        ppb.add_chrome(title=spec.title, subtitle=spec.subtitle, tag=spec.tag,
+                       notes=spec.notes, logo=spec.logo, dpi=spec.dpi)
+
+        if spec.filename is None:
+            buffer = io.BytesIO()
+            ppb.save(buffer, dpi=spec.dpi, format=spec.format or 'png')
+            result = ChartResult(index, data=buffer.getvalue())
+        else:
+            ppb.save(spec.filename, dpi=spec.dpi, format=spec.format)
+            result = ChartResult(index, filename=spec.filename)
+
+    except TimeoutError:
+        result = ChartResult(index, filename=spec.filename,
+                             error=f'Chart rendering timed out after {timeout} seconds')
+
+    except Exception:
+        # Exceptions are returned as text since they may not be picklable
+        result = ChartResult(index, filename=spec.filename, 
+                             error=traceback.format_exc())
+
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        if fig is not None:
+            ppb.plt.close(fig)
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _raise_timeout(signum, frame):
+    '''
+    Signal handler cancelling a chart that ran past its timeout
+    '''
+    raise TimeoutError('Chart rendering timed out')
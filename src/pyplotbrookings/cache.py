@@ -0,0 +1,314 @@
+'''
+Content addressed cache of rendered charts.
+
+Charts are keyed on a hash of their input data, the active theme (the 
+matplotlib style parameters), their titles, notes, and logo, and the output format, 
+size, and DPI. Unchanged charts are copied from the cache instead of being 
+drawn again:
+
+    import pyplotbrookings.cache as ppb_cache
+
+    cache = ppb_cache.ChartCache('.chart-cache', max_bytes=2**30)
+
+    def plot_rates(ax, dates, rates):
+        ax.plot(dates, rates)
+
+    cache.render('figures/rates.png', plot_rates, data=(dates, rates),
+                 title='Unemployment rate', logo='hc', dpi='retina')
+
+The build function is keyed on its code, default arguments, and closure 
+variables (not on the global variables it reads, pass those as data). Values
+without a stable hash (objects with the default repr) raise a TypeError.
+'''
+import enum
+import functools
+import hashlib
+import os
+import shutil
+import time
+import types
+
+import matplotlib as mpl
+import numpy as np
+
+from . import plotting
+from .theme import _package_version, _style_params
+
+
+class ChartCache:
+    '''
+    A size bounded directory of rendered charts. The least recently used 
+    charts are deleted when the cache grows past max_bytes (down to 90% of
+    max_bytes, so the directory is only scanned once in a while).
+
+    directory (str): Directory to store the cached charts in
+
+    max_bytes (int): Maximum total size of the cached charts
+    '''
+    # Temporary files younger than this (in seconds) may still be written 
+    # by another process and are never evicted
+    temp_grace = 600
+
+    def __init__(self, directory, max_bytes=2**30):
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        # Total size of the cache, counted on first use and kept up to date
+        # by put (files added by other processes are counted when scanning)
+        self._size = None
+
+    def key(self, build=None, data=(), **params):
+        '''
+        Returns the cache key (a hex digest) of a chart
+
+        build (callable): The function drawing the chart (its code, 
+            defaults, and closure variables are part of the key)
+
+        data (tuple): The chart inputs (arrays, data frame columns, numbers,
+            strings, ...)
+
+        **params: Any other chart parameters (titles, format, DPI, ...)
+        '''
+        digest = hashlib.blake2b(digest_size=20)
+        
+        if build is not None:
+            _update(digest, build)
+        for value in data:
+            _update(digest, value)
+        _update(digest, sorted(params.items()))
+        
+        # The active theme (without process settings like the backend) and 
+        # package version
+        _update(digest, _style_params(mpl.rcParams))
+        _update(digest, _package_version())
+        
+        return digest.hexdigest()
+
+    def path(self, key, format):
+        '''
+        Returns the cache path of a key
+        '''
+        return os.path.join(self.directory, key[:2], f'{key}.{format}')
+
+    def get(self, key, format):
+        '''
+        Returns the path of a cached chart (or None if it is not cached)
+        '''
+        path = self.path(key, format)
+        try:
+            # Mark the chart as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, format, source):
+        '''
+        Adds a rendered chart file to the cache and evicts old charts if the
+        cache is too large. Returns the cache path.
+        '''
+        path = self.path(key, format)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        try:
+            replaced = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced = 0
+
+        # Copy then rename so readers never see a partial file
+        temp = f'{path}.{os.getpid()}.tmp'
+        shutil.copyfile(source, temp)
+        os.replace(temp, path)
+
+        if self._size is None:
+            self._size = self._scan()[0]
+        else:
+            self._size += os.path.getsize(path) - replaced
+
+        if self._size > self.max_bytes:
+            self.evict()
+        return path
+
+    def size(self):
+        '''
+        Returns the total size of the cached charts in bytes
+        '''
+        self._size = self._scan()[0]
+        return self._size
+
+    def evict(self):
+        '''
+        Deletes the least recently used charts until the cache fits in 
+        90% of max_bytes. Temporary files of unfinished writes are kept 
+        (unless they are older than temp_grace).
+        '''
+        total, entries = self._scan()
+        target = 0.9 * self.max_bytes if total > self.max_bytes else self.max_bytes
+        now = time.time()
+
+        for mtime, size, path in sorted(entries):
+            if total <= target:
+                break
+            if path.endswith('.tmp') and now - mtime < self.temp_grace:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Already evicted by another process
+                pass
+            total -= size
+
+        self._size = total
+
+    def _scan(self):
+        '''
+        Returns the total size and the (mtime, size, path) entries of the 
+        cache directory
+        '''
+        entries = []
+        for folder in os.scandir(self.directory):
+            if folder.is_dir():
+                for entry in os.scandir(folder.path):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        return sum(size for _, size, _ in entries), entries
+
+    def render(self, filename, build, data=(), title=None, subtitle=None, tag=None, 
+               notes=(), logo=None, size='medium', dpi=None, format=None, **kwargs):
+        '''
+        Saves a chart to filename, copying it from the cache if a chart with
+        the same inputs was rendered before. Otherwise the chart is drawn with
+        build(ax, *data), Brookings titles, notes, and logo are added, and it 
+        is saved and cached. Keyword arguments are passed to save().
+
+        filename (str): Output path
+
+        build (callable): Function drawing the chart, build(ax, *data)
+
+        data (tuple): The chart inputs passed to build (hashed for the key)
+
+        title, subtitle, tag, notes, logo: See add_chrome
+
+        size (str or tuple): Brookings figure size (small, medium, large) 
+            or a (width, height) tuple in inches
+
+        dpi (str or float): Brookings DPI (retina, print, screen) or a number
+
+        format (str): Output format (defaults to the filename extension)
+
+        Returns True if the chart was copied from the cache
+        '''
+        format = format or os.path.splitext(filename)[1].lstrip('.').lower() or 'png'
+        key = self.key(build, data, title=title, subtitle=subtitle, tag=tag, 
+                       notes=tuple(notes), logo=logo, size=size, dpi=dpi,
+                       format=format, kwargs=kwargs)
+
+        cached = self.get(key, format)
+        if cached is not None:
+            shutil.copyfile(cached, filename)
+            return True
+
+        fig = plotting.figure(size)
+        try:
+            build(fig.add_subplot(), *data)
+            plotting.add_chrome(title=title, subtitle=subtitle, tag=tag, notes=notes,
+                                logo=logo, dpi=dpi)
+            plotting.save(filename, dpi=dpi, format=format, **kwargs)
+        finally:
+            plotting.plt.close(fig)
+
+        self.put(key, format, filename)
+        return False
+
+
+def _update(digest, value, _functions=()):
+    '''
+    Adds a value to a hash. Arrays are hashed by their raw bytes, 
+    containers element by element, functions by their code, defaults, and 
+    closure variables, and anything else by its repr. Objects with the 
+    default repr (which holds the memory address) raise a TypeError.
+    '''
+    if isinstance(value, (types.FunctionType, types.MethodType, functools.partial, 
+                          types.CodeType)):
+        _update_function(digest, value, _functions)
+        return
+
+    if hasattr(value, 'by_key'):
+        # Cyclers (e.g., axes.prop_cycle)
+        value = value.by_key()
+
+    if isinstance(value, dict):
+        value = sorted(value.items(), key=lambda item: repr(item[0]))
+    elif isinstance(value, (set, frozenset)):
+        # Set order depends on the (randomized) string hashes
+        value = sorted(value, key=repr)
+    elif isinstance(value, enum.Enum):
+        value = f'{type(value).__qualname__}.{value.name}'
+
+    if isinstance(value, (list, tuple)):
+        digest.update(b'(%d' % len(value))
+        for item in value:
+            _update(digest, item, _functions)
+        digest.update(b')')
+        return
+
+    if hasattr(value, '__array__') and not np.isscalar(value):
+        array = np.asarray(value)
+        if array.dtype.hasobject:
+            # Object arrays (e.g., strings in pandas) have no stable bytes
+            _update(digest, array.tolist(), _functions)
+            return
+
+        array = np.ascontiguousarray(array)
+        digest.update(f'array{array.dtype.str}{array.shape}'.encode())
+        digest.update(memoryview(array).cast('B'))
+        return
+
+    if type(value).__repr__ is object.__repr__:
+        raise TypeError(f'{type(value).__qualname__} objects have no stable hash for the '
+                        'cache key (give them a __repr__ or pass their data instead)')
+    digest.update(repr(value).encode())
+
+
+def _update_function(digest, value, functions):
+    '''
+    Adds a function (or method, partial, or code object) to a hash (see 
+    _update). Recursive references to a function are hashed by name.
+    '''
+    if isinstance(value, functools.partial):
+        digest.update(b'partial')
+        _update(digest, (value.func, value.args, value.keywords), functions)
+        return
+
+    if isinstance(value, types.MethodType):
+        digest.update(b'method')
+        _update(digest, (value.__func__, value.__self__), functions)
+        return
+
+    if isinstance(value, types.CodeType):
+        digest.update(b'code')
+        digest.update(value.co_code)
+        _update(digest, (value.co_consts, value.co_names), functions)
+        return
+
+    digest.update(f'function {value.__module__}.{value.__qualname__}'.encode())
+    if value in functions:
+        return
+    functions = functions + (value,)
+
+    cells = tuple(_cell_contents(cell) for cell in value.__closure__ or ())
+    _update(digest, (value.__code__, value.__defaults__, value.__kwdefaults__, cells), functions)
+
+
+def _cell_contents(cell):
+    '''
+    Returns the value of a closure cell (None if it is still empty)
+    '''
+    try:
+        return cell.cell_contents
+    except ValueError:
+        return None
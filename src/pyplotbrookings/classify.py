@@ -0,0 +1,271 @@
+'''
+Classification of values into colored classes for choropleth maps and
+heatmaps.
+
+Values are binned with one of four schemes and each class gets a color of a
+Brookings palette (palettes are interpolated when the number of classes and
+palette colors differ):
+
+    import pyplotbrookings.classify as ppb_classify
+
+    result = ppb_classify.classify(rates, scheme='natural_breaks', k=5,
+                                   palette='sequential (single hue)')
+
+    gdf.plot(color=result.to_rgba())
+    result.legend(ax, title='Unemployment rate')
+
+Schemes:
+    quantile: Classes with the same number of values
+    equal_interval: Classes of the same width
+    fixed: Classes between given breaks (bins)
+    natural_breaks: Fisher-Jenks optimal breaks minimizing the variance
+        within classes, computed on a random sample of the values
+'''
+from dataclasses import dataclass
+
+import numpy as np
+
+from .colors import palette_rgba, _palette_lut
+
+
+@dataclass
+class Classification:
+    '''
+    Classes of values (see classify)
+
+    scheme (str): The classification scheme
+
+    bins (array): Class edges (k + 1 values from the minimum to the maximum),
+        values equal to an upper edge belong to the lower class
+
+    classes (array): Class index of each value (-1 for missing values)
+
+    colors (array): (k, 4) RGBA colors of the classes
+
+    labels (list): Legend labels of the classes
+    '''
+    scheme: str
+    bins: np.ndarray
+    classes: np.ndarray
+    colors: np.ndarray
+    labels: list
+
+    @property
+    def k(self):
+        return len(self.colors)
+
+    @property
+    def counts(self):
+        '''
+        Number of values in each class
+        '''
+        return np.bincount(self.classes[self.classes >= 0].ravel(), minlength=self.k)
+
+    def to_rgba(self):
+        '''
+        Returns the RGBA color of each value (missing values are transparent)
+        '''
+        # The last row of the table is transparent for class -1
+        table = np.vstack([self.colors, np.zeros(4)])
+        return table[self.classes]
+
+    def legend_handles(self):
+        '''
+        Returns matplotlib patches (with labels) for a legend of the classes
+        '''
+        from matplotlib.patches import Patch
+
+        return [Patch(facecolor=color, label=label) for color, label in zip(self.colors, self.labels)]
+
+    def legend(self, ax=None, **kwargs):
+        '''
+        Adds a legend of the classes to an axis (the current pyplot axis if
+        None). Keyword arguments are passed to the matplotlib legend()
+        function.
+        '''
+        if ax is None:
+            from .plotting import plt
+            ax = plt.gca()
+
+        return ax.legend(handles=self.legend_handles(), **kwargs)
+
+
+def classify(values, scheme='quantile', k=5, palette='sequential (single hue)', reverse=False,
+             bins=None, sample=100000, seed=0, label_format='{:,.1f}'):
+    '''
+    Bins values into classes colored with a Brookings palette. Returns a
+    Classification.
+
+    values (array): Values to classify (missing values are NaN)
+
+    scheme (str): One of 'quantile', 'equal_interval', 'fixed', or
+        'natural_breaks'
+
+    k (int): Number of classes (ignored by the fixed scheme)
+
+    palette (str): Name of the Brookings palette (e.g., 'diverging')
+
+    reverse (bool): If the palette should be reversed
+
+    bins (list): Breaks between the classes of the fixed scheme (k - 1
+        increasing values)
+
+    sample (int): Number of values used to find natural breaks (all values
+        are used if None)
+
+    seed (int): Random seed of the natural breaks sample
+
+    label_format (str): Format of the numbers in the legend labels
+    '''
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    # Values are only copied if some are missing
+    missing = not valid.all()
+    finite = values[valid] if missing else values
+
+    if finite.size == 0:
+        raise Exception('There are no values to classify')
+
+    low, high = finite.min(), finite.max()
+
+    if scheme == 'quantile':
+        inner = np.quantile(finite, np.linspace(0, 1, k + 1)[1:-1])
+    elif scheme == 'equal_interval':
+        inner = np.linspace(low, high, k + 1)[1:-1]
+    elif scheme == 'fixed':
+        if bins is None:
+            raise Exception("The fixed scheme needs bins (the breaks between classes)")
+        inner = np.asarray(bins, dtype=float)
+    elif scheme == 'natural_breaks':
+        if sample is not None and finite.size > sample:
+            rng = np.random.default_rng(seed)
+            finite = finite[rng.integers(0, finite.size, sample)]
+        inner = _natural_breaks(finite, k)
+    else:
+        raise Exception("Scheme must be one of 'quantile', 'equal_interval', 'fixed', or 'natural_breaks'")
+
+    # Repeated breaks (e.g., quantiles of skewed data) would give empty classes
+    inner = np.unique(inner) if scheme != 'fixed' else inner
+    edges = np.concatenate([[min(low, inner[0]) if len(inner) else low], inner,
+                            [max(high, inner[-1]) if len(inner) else high]])
+    k = len(edges) - 1
+
+    classes = np.full(values.shape, -1, dtype=np.int8 if k < 127 else np.int32)
+    # Values equal to a break belong to the lower class
+    if missing:
+        classes[valid] = np.searchsorted(inner, values[valid], side='left')
+    else:
+        classes[...] = np.searchsorted(inner, values, side='left')
+
+    colors = _class_colors(palette, reverse, k)
+    labels = [f'{label_format.format(a)} – {label_format.format(b)}' for a, b in zip(edges[:-1], edges[1:])]
+    return Classification(scheme, edges, classes, colors, labels)
+
+
+def _class_colors(palette, reverse, k):
+    '''
+    Returns k RGBA colors of a palette (the palette colormap is sampled if
+    the palette doesn't have exactly k colors)
+    '''
+    colors = palette_rgba(palette, reverse)
+    if len(colors) == k:
+        return colors.copy()
+    return np.array(_palette_lut(palette, reverse, k))
+
+
+def _natural_breaks(values, k):
+    '''
+    Returns the k - 1 Fisher-Jenks breaks of values (the upper bounds of the
+    first k - 1 classes). The optimal classes are found by dynamic
+    programming over the distinct values weighted by their counts.
+    '''
+    unique, counts = np.unique(values, return_counts=True)
+    m = len(unique)
+    if m <= k:
+        return unique[:-1]
+
+    # Centered values reduce the rounding error of the sums of squares
+    centered = unique - unique.mean()
+    w = np.concatenate([[0], np.cumsum(counts, dtype=float)])
+    wx = np.concatenate([[0], np.cumsum(counts * centered)])
+    wx2 = np.concatenate([[0], np.cumsum(counts * centered**2)])
+
+    # cost[b]: smallest sum of squared deviations of values[:b] in c classes
+    ends = np.arange(m + 1)
+    cost = _sum_squares(w, wx, wx2, np.zeros_like(ends), ends)
+    starts = []
+    for c in range(1, k):
+        cost, start = _add_class(cost, w, wx, wx2, c)
+        starts.append(start)
+
+    # Follow the class starts back from the last value
+    breaks = []
+    end = m
+    for start in reversed(starts):
+        end = start[end]
+        breaks.append(unique[end - 1])
+
+    return np.array(breaks[::-1])
+
+
+def _add_class(cost, w, wx, wx2, c):
+    '''
+    Returns the cost of splitting values[:b] into c + 1 classes for every b,
+    and where the last class starts (one step of _natural_breaks).
+
+    The best start of the last class never decreases as b grows, so it is
+    found by divide and conquer: the best start for the middle b of a range
+    bounds the starts searched for the b below and above it. All ranges of
+    a level are searched at once, O(m log m) work per class.
+    '''
+    m = len(cost) - 1
+    new_cost = np.full(m + 1, np.inf)
+    new_start = np.zeros(m + 1, dtype=np.intp)
+
+    # Ranges of ends [b_low, b_high] and of their possible starts [a_low, a_high]
+    b_low, b_high = np.array([c + 1]), np.array([m])
+    a_low, a_high = np.array([c]), np.array([m - 1])
+
+    while b_low.size:
+        mid = (b_low + b_high) // 2
+        high = np.minimum(a_high, mid - 1)
+        lengths = high - a_low + 1
+
+        # Every candidate start of every middle end (one segment per range)
+        offsets = np.cumsum(lengths) - lengths
+        segment = np.repeat(np.arange(len(mid)), lengths)
+        a = a_low[segment] + np.arange(lengths.sum()) - offsets[segment]
+        total = cost[a] + _sum_squares(w, wx, wx2, a, mid[segment])
+
+        # First start with the smallest cost of each segment
+        best = np.minimum.reduceat(total, offsets)
+        first = np.flatnonzero(total == best[segment])
+        first = first[np.unique(segment[first], return_index=True)[1]]
+
+        new_cost[mid] = best
+        new_start[mid] = a[first]
+
+        # Ends below the middle start at most where it does, ends above at least
+        b_low, b_high, a_low, a_high = (np.concatenate([b_low, mid + 1]),
+                                        np.concatenate([mid - 1, b_high]),
+                                        np.concatenate([a_low, a[first]]),
+                                        np.concatenate([a[first], a_high]))
+        keep = b_low <= b_high
+        b_low, b_high, a_low, a_high = b_low[keep], b_high[keep], a_low[keep], a_high[keep]
+
+    return new_cost, new_start
+
+
+def _sum_squares(w, wx, wx2, a, b):
+    '''
+    Returns the weighted sums of squared deviations of the value ranges
+    [a, b) from cumulative sums (inf for empty ranges)
+    '''
+    weight = w[b] - w[a]
+    total = wx[b] - wx[a]
+    squares = wx2[b] - wx2[a]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.maximum(squares - total**2 / weight, 0)
+    result[weight <= 0] = np.inf
+    return result
@@ -0,0 +1,254 @@
+'''
+Vectorized (NumPy) mapping of data to Brookings palette colors.
+'''
+import functools
+
+import numpy as np
+
+from .palettes import get_palette, get_color
+
+
+def to_rgba_array(colors):
+    '''
+    Converts an array of colors to an array of RGBA floats with the shape of
+    the input plus a last axis of 4 (a single color gives a (1, 4) array).
+    Arrays of '#RRGGBB' hexcodes are decoded with vectorized NumPy 
+    operations, other colors (named colors, '#RGB', ...) are converted once 
+    per unique value.
+
+    colors (array): A list like object of matplotlib colors
+    '''
+    colors = np.asarray(colors)
+
+    if colors.size == 0:
+        return np.zeros((0, 4))
+
+    # Already numeric RGB(A) values
+    if colors.dtype.kind in 'fiu':
+        colors = np.atleast_2d(colors).astype(float)
+        if colors.shape[-1] == 3:
+            colors = np.concatenate([colors, np.ones(colors.shape[:-1] + (1,))], axis=-1)
+        return colors
+
+    colors = np.ascontiguousarray(np.atleast_1d(colors), dtype=str)
+    shape = colors.shape
+    colors = colors.ravel()
+
+    # Fast path: every color is a '#RRGGBB' hexcode
+    if colors.dtype.itemsize // 4 == 7:
+        # Unicode code points of each character
+        chars = colors.view(np.uint32).reshape(-1, 7)
+        if np.all(chars[:, 0] == ord('#')):
+            digits = _hex_digits[np.minimum(chars[:, 1:], 255)]
+            if np.all(digits < 16):
+                rgba = np.ones((len(colors), 4))
+                rgba[:, :3] = (digits[:, 0::2] * 16 + digits[:, 1::2]) / 255
+                return rgba.reshape(shape + (4,))
+
+    # Otherwise convert each unique color once
+    from matplotlib.colors import to_rgba_array as mpl_to_rgba_array
+
+    unique, inverse = _unique_strings(colors)
+    return mpl_to_rgba_array(unique)[inverse].reshape(shape + (4,))
+
+
+def palette_rgba(name, reverse=False):
+    '''
+    Given a palette name returns its colors as an (n, 4) array of RGBA floats
+
+    name (str): The palette name.
+
+    reverse (bool): If the palette should be reversed
+    '''
+    palette = get_palette(name)
+    rgba = _palette_rgba(tuple(palette))
+
+    return rgba[::-1] if reverse else rgba
+
+
+def map_values(values, name, vmin=None, vmax=None, reverse=False, n=256):
+    '''
+    Maps an array of numbers to RGBA colors along a continuous Brookings 
+    palette (the palette interpolated like get_cmap). Values outside of 
+    vmin and vmax (including -inf and inf) are clipped to the ends of the 
+    palette. Missing values (NaN) are mapped to a transparent color, so are 
+    all values if none are finite.
+
+    values (array): Array of numbers to map
+
+    name (str): Name of the Brookings color palette
+
+    vmin, vmax (float): The data range mapped to the ends of the palette
+        (defaults to the minimum and maximum of the finite values, also 
+        used if vmin or vmax is NaN)
+
+    reverse (bool): If the palette should be reversed
+
+    n (int): Number of colors in the interpolated lookup table
+    '''
+    values = np.asarray(values, dtype=float)
+    lut = _palette_lut(name, reverse, n)
+
+    if vmin is None or np.isnan(vmin) or vmax is None or np.isnan(vmax):
+        finite = values[np.isfinite(values)]
+        if finite.size == 0:
+            # No data range to map
+            return np.zeros(values.shape + (4,))
+        vmin = finite.min() if vmin is None or np.isnan(vmin) else vmin
+        vmax = finite.max() if vmax is None or np.isnan(vmax) else vmax
+
+    # Index of each value in the lookup table
+    missing = np.isnan(values)
+    if vmax > vmin:
+        index = (np.clip(values, vmin, vmax) - vmin) * (n / (vmax - vmin))
+        index = np.minimum(np.nan_to_num(index), n - 1)
+    else:
+        # No range to interpolate, values above it get the last color
+        index = np.where(values > vmax, n - 1, 0)
+    rgba = lut[index.astype(np.intp)]
+    rgba[missing] = 0
+    
+    return rgba
+
+
+def map_categories(codes, name, reverse=False):
+    '''
+    Maps an array of integer category codes to RGBA colors of a Brookings 
+    palette (code i gets the ith palette color, wrapping around if there are 
+    more categories than colors). Negative codes (e.g., missing values) are 
+    mapped to a transparent color.
+
+    codes (array): Array of integer category codes
+
+    name (str): Name of the Brookings color palette
+
+    reverse (bool): If the palette should be reversed
+    '''
+    codes = np.asarray(codes, dtype=np.intp)
+    palette = palette_rgba(name, reverse)
+
+    rgba = palette[codes % len(palette)]
+    rgba[codes < 0] = 0
+    
+    return rgba
+
+
+def map_color_names(names):
+    '''
+    Maps an array of Brookings color names (e.g., 'yellow 50') to RGBA colors
+    (an array with the shape of names plus a last axis of 4). Each unique 
+    name is only looked up once.
+
+    names (array): Array of Brookings color names (see get_color)
+    '''
+    names = np.ascontiguousarray(np.atleast_1d(names), dtype=str)
+    unique, inverse = _unique_strings(names.ravel())
+
+    colors = to_rgba_array([get_color(name) for name in unique])
+    
+    return colors[inverse].reshape(names.shape + (4,))
+
+
+def get_text_colors(backgrounds, as_hex=True):
+    '''
+    Returns recommended colors of text (either black or white) to use with 
+    an array of background colors. Color selection is adherent to W3C 
+    guidelines. 
+
+    backgrounds (array): Array of background colors (hexcodes, named 
+        colors, or RGB(A) values)
+
+    as_hex (bool): If true return hexcodes ('#000000' or '#FFFFFF'), 
+        otherwise return RGBA values (with a last axis of 4)
+    
+    @Source: Mark Ransom (https://stackoverflow.com/questions/3942878/
+    how-to-decide-font-color-in-white-or-black-depending-on-background-color)
+    '''
+    rgb = to_rgba_array(backgrounds)[..., :3]
+
+    # Adjusting RGB values
+    rgb = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    # Getting color luminosity
+    L = rgb @ np.array([0.2126, 0.7152, 0.0722])
+
+    # Black or white depending on color luminosity
+    dark = L > 0.179
+    if as_hex:
+        return np.where(dark, '#000000', '#FFFFFF')
+
+    rgba = np.ones(L.shape + (4,))
+    rgba[dark, :3] = 0
+    return rgba
+
+
+def _unique_strings(strings):
+    '''
+    Returns the unique values of a 1D string array and the indices that
+    reconstruct the array from them (like np.unique with return_inverse). 
+    Strings are hashed to integers first, which is much faster than sorting
+    the strings themselves.
+    '''
+    if len(strings) == 0:
+        return strings, np.zeros(0, dtype=np.intp)
+
+    # Pad the strings to a multiple of 8 bytes so they can be read as words
+    if strings.dtype.itemsize % 8:
+        strings = strings.astype('<U%d' % (strings.dtype.itemsize // 4 + 1))
+    words = strings.view(np.uint64).reshape(len(strings), -1)
+
+    # Multiplicative hash over the 64 bit words of each string
+    hashes = words[:, 0].copy()
+    for i in range(1, words.shape[1]):
+        hashes *= np.uint64(0x9E3779B97F4A7C15)
+        hashes ^= words[:, i]
+
+    _, inverse = np.unique(hashes, return_inverse=True)
+    inverse = inverse.ravel()
+    # Any occurrence of each unique hash can represent it
+    first = np.empty(inverse.max(initial=-1) + 1, dtype=np.intp)
+    first[inverse] = np.arange(len(strings))
+    unique = strings[first]
+
+    # Fall back to sorting the strings on a hash collision
+    if not np.array_equal(unique[inverse], strings):
+        unique, inverse = np.unique(strings, return_inverse=True)
+        inverse = inverse.ravel()
+
+    return unique, inverse
+
+
+@functools.lru_cache(maxsize=None)
+def _palette_rgba(colors):
+    '''
+    Returns a tuple of palette colors as a read only RGBA array (cached)
+    '''
+    rgba = to_rgba_array(colors)
+    rgba.setflags(write=False)
+    return rgba
+
+
+def _palette_lut(name, reverse, n):
+    '''
+    Returns the (n, 4) RGBA lookup table of a palette's colormap
+    '''
+    return _palette_lut_cached(tuple(get_palette(name)), name, reverse, n)
+
+
+@functools.lru_cache(maxsize=128)
+def _palette_lut_cached(colors, name, reverse, n):
+    '''
+    Returns a colormap lookup table (cached by the palette colors so 
+    palettes replaced by make_palette() are rebuilt)
+    '''
+    from .theme import get_cmap
+
+    lut = get_cmap(name, reverse, N=n)(np.arange(n))
+    lut.setflags(write=False)
+    return lut
+
+
+# Value of each ASCII character as a hex digit (16 if it is not a hex digit)
+_hex_digits = np.full(256, 16, dtype=np.uint8)
+_hex_digits[np.frombuffer(b'0123456789', np.uint8)] = np.arange(10)
+_hex_digits[np.frombuffer(b'abcdef', np.uint8)] = np.arange(10, 16)
+_hex_digits[np.frombuffer(b'ABCDEF', np.uint8)] = np.arange(10, 16)
@@ -0,0 +1,110 @@
+'''
+Density scatter plots: points are counted on a pixel grid and drawn as one
+image colored with a Brookings palette.
+'''
+import matplotlib.colors
+import matplotlib.pyplot as plt
+import numpy as np
+
+from .theme import get_cmap
+
+
+def density_scatter(x, y=None, ax=None, bins=None, extent=None, 
+                    palette='sequential (single hue)', reverse=True, norm='log',
+                    colorbar=True, colorbar_label='Count'):
+    '''
+    Plots a scatter plot of many points (millions or more) as a 2D histogram
+    image. Points can be passed in chunks, so the full data set never has to
+    be in memory:
+
+        def chunks():
+            for frame in pd.read_csv('points.csv', chunksize=1_000_000):
+                yield frame['x'].values, frame['y'].values
+
+        ppb.density_scatter(chunks(), extent=(0, 100, 0, 50))
+
+    x (array): The x values, or an iterable of (x, y) chunks if y is None
+
+    y (array): The y values
+
+    ax: Optional matplotlib axis to plot on (defaults to the current axis)
+
+    bins (int or tuple): Number of bins in x and y (defaults to the axis 
+        size in pixels)
+
+    extent (tuple): The (xmin, xmax, ymin, ymax) range to bin. Defaults to
+        the data range (required when passing chunks).
+
+    palette (str): Name of a Brookings palette used as the colormap (e.g., 
+        'sequential (single hue)' or 'vivid blue')
+
+    reverse (bool): If the palette should be reversed (Brookings sequential 
+        palettes start with the darkest color, reversing them draws dense 
+        areas dark)
+
+    norm (str): Color scaling of the counts, either 'log' or 'linear'
+
+    colorbar (bool): If true add a colorbar for the counts
+
+    colorbar_label (str): The colorbar label
+
+    Returns the matplotlib image
+    '''
+    if ax is None:
+        ax = plt.gca()
+
+    if y is None:
+        chunks = x
+        if extent is None:
+            raise Exception('An extent is required when plotting chunks of points')
+    else:
+        chunks = [(x, y)]
+        if extent is None:
+            extent = (np.nanmin(x), np.nanmax(x), np.nanmin(y), np.nanmax(y))
+
+    # One bin per pixel by default
+    if bins is None:
+        bins = (int(ax.bbox.width), int(ax.bbox.height))
+    nx, ny = (bins, bins) if np.isscalar(bins) else bins
+
+    counts = np.zeros(nx * ny, dtype=np.int64)
+    for chunk_x, chunk_y in chunks:
+        counts += _bin_counts(np.asarray(chunk_x, dtype=float), 
+                              np.asarray(chunk_y, dtype=float), extent, nx, ny)
+    counts = counts.reshape(ny, nx)
+
+    if norm == 'log':
+        norm = matplotlib.colors.LogNorm(vmin=1, vmax=max(counts.max(), 1))
+    elif norm == 'linear':
+        norm = matplotlib.colors.Normalize(vmin=0, vmax=max(counts.max(), 1))
+    else:
+        raise Exception("norm must be one of 'log' or 'linear'")
+
+    # Empty bins are left transparent
+    image = ax.imshow(np.ma.masked_equal(counts, 0), origin='lower', extent=extent,
+                      aspect='auto', interpolation='nearest', norm=norm,
+                      cmap=get_cmap(palette, reverse))
+
+    if colorbar:
+        ax.get_figure().colorbar(image, ax=ax, label=colorbar_label)
+
+    return image
+
+
+def _bin_counts(x, y, extent, nx, ny):
+    '''
+    Returns the flattened (row major, y by x) counts of points in each bin
+    '''
+    xmin, xmax, ymin, ymax = extent
+
+    # Bin of each point (points on the upper edges go in the last bin)
+    col = np.floor((x - xmin) * (nx / (xmax - xmin)))
+    row = np.floor((y - ymin) * (ny / (ymax - ymin)))
+    col[x == xmax] = nx - 1
+    row[y == ymax] = ny - 1
+
+    # Drop points outside of the extent (and NaN values)
+    inside = (col >= 0) & (col < nx) & (row >= 0) & (row < ny)
+    index = row[inside].astype(np.int64) * nx + col[inside].astype(np.int64)
+
+    return np.bincount(index, minlength=nx * ny)
@@ -0,0 +1,327 @@
+'''
+Line charts for long time series, downsampled to the figure resolution, and
+direct labels for lines.
+'''
+import matplotlib as mpl
+from matplotlib.font_manager import FontProperties
+from matplotlib.lines import Line2D
+import matplotlib.pyplot as plt
+import numpy as np
+
+from .text import text_width
+
+
+def line(x, y, ax=None, labels=None, **kwargs):
+    '''
+    Plots one or more long series as lines that are downsampled to what the
+    axis can show. Each pixel column keeps the first, last, minimum, and 
+    maximum point of the data it covers, so the drawn line looks the same 
+    as the full series. Downsampling is redone at every draw, so zooming,
+    resizing, and saving at a higher DPI show more detail.
+
+    Line colors follow the axis color cycle (e.g., set with set_palette()).
+    Keyword arguments are passed to matplotlib's ax.plot() function.
+
+    x (array): The x values (numbers or dates) shared by all series
+
+    y (array): The y values, one series or a 2D array with a series in
+        each column
+
+    ax: Optional matplotlib axis to plot on (defaults to the current axis)
+
+    labels (list): Optional labels for the series (for legends)
+
+    Returns a list of the plotted lines
+    '''
+    if ax is None:
+        ax = plt.gca()
+
+    y = np.asarray(y)
+    ys = y.reshape(len(y), -1).T
+    if labels is None:
+        labels = [kwargs.pop('label', None)] * len(ys)
+
+    # Dates and other units are converted to numbers once
+    ax.xaxis.update_units(x)
+    x = np.asarray(ax.xaxis.convert_units(x), dtype=float)
+
+    # The downsampling needs sorted x values
+    order = None if np.all(x[1:] >= x[:-1]) else np.argsort(x, kind='stable')
+    if order is not None:
+        x = x[order]
+
+    lines = []
+    for series, label in zip(ys, labels):
+        series = np.asarray(series, dtype=float)
+        if order is not None:
+            series = series[order]
+
+        # A coarse version sets the data limits and styles the line
+        index = _minmax_index(x, series, x[0], x[-1], 1000)
+        styled, = ax.plot(x[index], series[index], label=label, **kwargs)
+
+        # Replace it with a line that downsamples itself when drawn
+        line = _DownsampledLine(x, series, x[index], series[index])
+        line.update_from(styled)
+        line.set_label(styled.get_label())
+        styled.remove()
+        ax.add_line(line)
+        lines.append(line)
+
+    return lines
+
+
+class _DownsampledLine(Line2D):
+    '''
+    Line that keeps the full series and draws a min/max per pixel version of
+    the part that is in view
+    '''
+    def __init__(self, x, y, x_start, y_start, **kwargs):
+        super().__init__(x_start, y_start, **kwargs)
+        self._full_x = x
+        self._full_y = y
+        # View of the last downsampling (reused while the view is unchanged)
+        self._view = None
+
+    def draw(self, renderer):
+        ax = self.axes
+        if ax is not None:
+            # Points in view (plus one on each side to reach the edges)
+            xmin, xmax = sorted(ax.get_xlim())
+            start = max(np.searchsorted(self._full_x, xmin) - 1, 0)
+            stop = np.searchsorted(self._full_x, xmax, side='right') + 1
+
+            # Pixel columns at the current (drawing) DPI
+            pixels = max(int(ax.bbox.width), 1)
+            
+            view = (xmin, xmax, pixels)
+            if view != self._view:
+                x, y = self._full_x[start:stop], self._full_y[start:stop]
+
+                if len(x) > 4 * pixels:
+                    index = _minmax_index(x, y, xmin, xmax, pixels)
+                    x, y = x[index], y[index]
+                self.set_data(x, y)
+                self._view = view
+
+        super().draw(renderer)
+
+
+def _minmax_index(x, y, xmin, xmax, buckets):
+    '''
+    Returns the (sorted) indices of the first, last, minimum, and maximum
+    point in each of the equal width x buckets between xmin and xmax
+
+    x (array): Sorted x values
+
+    y (array): The y values (NaN values are ignored for minimums and maximums)
+
+    buckets (int): Number of buckets (e.g., pixel columns)
+    '''
+    if len(x) <= 4 * buckets:
+        return np.arange(len(x))
+
+    # First index of each non-empty bucket
+    edges = np.linspace(xmin, xmax, buckets + 1)[1:-1]
+    starts = np.unique(np.concatenate([[0], np.searchsorted(x, edges)]))
+    starts = starts[starts < len(x)]
+    ends = np.append(starts[1:], len(x))
+
+    counts = ends - starts
+    index = np.arange(len(x))
+    
+    # Index of the (first) minimum and maximum point of each bucket
+    extremes = []
+    for reduce in (np.fmin, np.fmax):
+        values = reduce.reduceat(y, starts)
+        candidates = np.where(y == np.repeat(values, counts), index, len(x))
+        # Buckets of only NaN values fall back to their last point
+        extremes.append(np.minimum(np.minimum.reduceat(candidates, starts), ends - 1))
+
+    return np.unique(np.concatenate([starts, ends - 1] + extremes))
+
+
+def label_lines(lines=None, ax=None, labels=None, size=None, pad=3, along=True):
+    '''
+    Labels lines directly (instead of with a legend). Each label is placed 
+    right of the end of its line, moved up or down to avoid other labels and
+    lines, or placed along the line if the end is crowded. Labels are 
+    colored like their lines.
+
+    lines (list): Lines to label (defaults to the labeled lines of the axis)
+
+    ax: Optional matplotlib axis (defaults to the current axis)
+
+    labels (list): Optional label of each line (defaults to the line labels)
+
+    size (float): Font size of the labels (defaults to the legend font size)
+
+    pad (float): Space between the labels and the lines in points
+
+    along (bool): Place labels along the lines when their end is crowded
+
+    Returns the list of label annotations
+    '''
+    if ax is None:
+        ax = plt.gca()
+    if lines is None:
+        lines = [line for line in ax.get_lines() if not line.get_label().startswith('_')]
+    if labels is None:
+        labels = [line.get_label() for line in lines]
+    if size is None:
+        size = FontProperties(size=mpl.rcParams['legend.fontsize']).get_size_in_points()
+
+    fig = ax.figure
+    # Reading the limits applies any pending autoscaling before transforming
+    ax.get_xlim(), ax.get_ylim()
+    # Display pixels per point
+    scale = fig.dpi / 72
+    pad = pad * scale
+    index = _GridIndex(fig.bbox, cell=2 * scale)
+
+    # Points of the lines (in display pixels), added to the index
+    paths = []
+    for line in lines:
+        xy = line.get_transform().transform(line.get_xydata())
+        xy = xy[np.isfinite(xy).all(axis=1)]
+        index.add_path(_densify(xy, index.cell))
+        # Labels are only placed next to the visible part of the line
+        box = ax.bbox
+        visible = ((xy[:, 0] >= box.x0) & (xy[:, 0] <= box.x1) 
+                   & (xy[:, 1] >= box.y0) & (xy[:, 1] <= box.y1))
+        paths.append(xy[visible])
+
+    # Labels of the highest line ends are placed first
+    ends = [xy[np.argmax(xy[:, 0]), 1] if len(xy) else 0 for xy in paths]
+    order = sorted(range(len(lines)), key=lambda i: -ends[i])
+
+    annotations = [None] * len(lines)
+    for i in order:
+        xy, label = paths[i], labels[i]
+        if not len(xy) or not label:
+            continue
+
+        width = text_width(label, size) * scale
+        height = 1.2 * size * scale
+
+        box = _place_label(index, xy, width, height, pad, ax.bbox if along else None)
+        index.add_box(box)
+
+        # Offset of the label center from its anchor point (in points)
+        anchor = box[4]
+        center = ((box[0] + box[2]) / 2, (box[1] + box[3]) / 2)
+        data = ax.transData.inverted().transform(anchor)
+        annotations[i] = ax.annotate(label, data, xytext=((center[0] - anchor[0]) / scale, 
+                                                          (center[1] - anchor[1]) / scale),
+                                     textcoords='offset points', ha='center', va='center',
+                                     size=size, color=lines[i].get_color(), 
+                                     annotation_clip=False)
+
+    return [annotation for annotation in annotations if annotation is not None]
+
+
+def _place_label(index, xy, width, height, pad, bounds=None):
+    '''
+    Returns the first free label box (x0, y0, x1, y1, anchor) of a line: 
+    right of its end (moved up or down up to three label heights), or along
+    the line (above or below) inside the bounds (the axes, None to only use
+    the end). If no box is free, the box covering the fewest labels (then 
+    lines) is used.
+    '''
+    end = xy[np.argmax(xy[:, 0])]
+    boxes = []
+    for step in (0, 0.5, -0.5, 1, -1, 1.5, -1.5, 2, -2, 3, -3):
+        y = end[1] + step * height
+        boxes.append((end[0] + pad, y - height / 2, end[0] + pad + width, y + height / 2, end))
+
+    if bounds is not None:
+        # Points along the line, starting near the end
+        for point in xy[np.linspace(len(xy) - 1, 0, 20).astype(int)]:
+            for side in (1, -1):
+                y = point[1] + side * (pad + height / 2)
+                box = (point[0] - width / 2, y - height / 2, point[0] + width / 2, 
+                       y + height / 2, point)
+                if (box[0] >= bounds.x0 and box[1] >= bounds.y0 
+                        and box[2] <= bounds.x1 and box[3] <= bounds.y1):
+                    boxes.append(box)
+
+    for box in boxes:
+        if not index.collides(box):
+            return box
+    return min(boxes, key=index.overlap)
+
+
+def _densify(xy, step):
+    '''
+    Returns points along a path (in display pixels) at most step apart
+    '''
+    if len(xy) < 2:
+        return xy
+
+    lengths = np.hypot(*np.diff(xy, axis=0).T)
+    counts = np.maximum(np.ceil(lengths / step).astype(int), 1)
+
+    # Interpolation position of every new point inside its segment
+    segment = np.repeat(np.arange(len(counts)), counts)
+    t = (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)) / counts[segment]
+    points = xy[segment] + (xy[segment + 1] - xy[segment]) * t[:, None]
+    return np.vstack([points, xy[-1:]])
+
+
+class _GridIndex:
+    '''
+    Uniform grid over the figure marking the cells covered by lines and
+    labels, so collisions are checked against the few cells under a box
+    instead of against every other line and label. Label cells weigh more
+    than line cells when overlaps can't be avoided.
+
+    bbox: The figure bounding box (in display pixels)
+
+    cell (float): Cell size in display pixels
+    '''
+    def __init__(self, bbox, cell):
+        self.bbox = bbox
+        self.x0, self.y0 = bbox.x0, bbox.y0
+        self.cell = cell
+        # Labels may stick out of the figure, so the grid has a margin
+        self.margin = 64
+        shape = (int(bbox.height / cell) + 2 * self.margin, int(bbox.width / cell) + 2 * self.margin)
+        self.grid = np.zeros(shape, dtype=np.uint8)
+
+    def _cells(self, x, y):
+        rows = np.clip(((y - self.y0) / self.cell).astype(int) + self.margin, 0, self.grid.shape[0] - 1)
+        cols = np.clip(((x - self.x0) / self.cell).astype(int) + self.margin, 0, self.grid.shape[1] - 1)
+        return rows, cols
+
+    def add_path(self, xy):
+        '''
+        Marks the cells of points (in display pixels)
+        '''
+        rows, cols = self._cells(xy[:, 0], xy[:, 1])
+        self.grid[rows, cols] = np.maximum(self.grid[rows, cols], 1)
+
+    def _box_cells(self, box):
+        (r0, r1), (c0, c1) = self._cells(np.array(box[0:3:2]), np.array(box[1:4:2]))
+        return slice(r0, r1 + 1), slice(c0, c1 + 1)
+
+    def add_box(self, box):
+        '''
+        Marks the cells of a box (x0, y0, x1, y1)
+        '''
+        self.grid[self._box_cells(box)] = 100
+
+    def collides(self, box):
+        '''
+        Returns if a box (x0, y0, x1, y1) covers any marked cell or leaves
+        the figure
+        '''
+        if (box[0] < self.bbox.x0 or box[1] < self.bbox.y0 
+                or box[2] > self.bbox.x1 or box[3] > self.bbox.y1):
+            return True
+        return bool(self.grid[self._box_cells(box)].any())
+
+    def overlap(self, box):
+        '''
+        Returns the weighted number of marked cells under a box
+        '''
+        return int(self.grid[self._box_cells(box)].sum())
@@ -0,0 +1,244 @@
+'''
+Live Brookings charts for streaming data.
+
+A LiveChart keeps the last points of each series in fixed size ring buffers
+and only redraws its lines when new points arrive. The titles, notes, logo,
+and axes are drawn once and blitted back under the lines; the full figure is
+only redrawn when the data leaves the axes limits:
+
+    import pyplotbrookings.live as ppb_live
+
+    chart = ppb_live.LiveChart(2, capacity=500, title='Requests per second',
+                               labels=['GET', 'POST'])
+    ppb.plt.show(block=False)
+
+    while True:
+        t, get, post = feed.read()
+        chart.append(t, get, series=0)
+        chart.append(t, post, series=1)
+        chart.update()
+
+x values may be numbers or dates (NumPy datetime64 or datetime objects), 
+the type of each line is set by its first points.
+'''
+import numpy as np
+
+from . import plotting
+
+
+class LiveChart:
+    '''
+    A line chart updated with streaming data (see module documentation)
+
+    series (int): Number of lines
+
+    capacity (int): Number of points kept for each line (older points are
+        dropped)
+
+    ax: Optional matplotlib axis to draw on. By default a new pyplot figure
+        of the given size is created.
+
+    size (str or tuple): Brookings figure size (small, medium, or large) or
+        size in inches
+
+    title, subtitle, tag (str): Chart titles (see add_title)
+
+    notes (list): Notes to place at the bottom of the figure (see add_notes)
+
+    logo (str): Logo path or abbreviation of a supported logo (see add_logo)
+
+    labels (list): Optional legend labels of the lines
+
+    margin (float): Room left past the data (as a fraction of the data
+        range) when the axes are rescaled, so rescaling is rare
+
+    Keyword arguments are passed to the matplotlib plot() function.
+    '''
+    def __init__(self, series=1, capacity=1000, ax=None, size='medium', title=None,
+                 subtitle=None, tag=None, notes=(), logo=None, labels=None,
+                 margin=0.1, **kwargs):
+        if ax is None:
+            fig = plotting.figure(size)
+            ax = fig.add_subplot()
+
+        self.ax = ax
+        self.fig = ax.figure
+        self.margin = margin
+        self.redraws = 0
+
+        self._x = [_RingBuffer(capacity) for _ in range(series)]
+        self._y = [_RingBuffer(capacity) for _ in range(series)]
+
+        # Lines are animated: they are left out of full draws and blitted
+        self.lines = []
+        for i in range(series):
+            label = labels[i] if labels is not None else None
+            line, = ax.plot([], [], label=label, animated=True, **kwargs)
+            self.lines.append(line)
+
+        if labels is not None:
+            ax.legend()
+
+        plotting.add_chrome(title=title, subtitle=subtitle, tag=tag, notes=notes,
+                            logo=logo, fig=self.fig)
+
+        self._background = None
+        self._stale = True
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def append(self, x, y, series=0):
+        '''
+        Adds points (numbers or arrays) to the end of a line
+        '''
+        x, y = np.atleast_1d(x), np.atleast_1d(y)
+        self._x[series].extend(x)
+        self._y[series].extend(y)
+        # Dates are plotted with the matplotlib date units
+        self.ax.xaxis.update_units(self._x[series].view())
+
+        # The axes are rescaled when the new points leave the limits
+        if not self._stale and len(x):
+            x = self.ax.convert_xunits(self._x[series].view()[-len(x):])
+            (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+            self._stale = bool(x.min() < x0 or x.max() > x1 or y.min() < y0 or y.max() > y1)
+
+    def data(self, series=0):
+        '''
+        Returns the points kept for a line (views of the ring buffers)
+        '''
+        return self._x[series].view(), self._y[series].view()
+
+    def update(self):
+        '''
+        Draws the lines with the new points. The figure is only redrawn
+        (with new axes limits) when the data left the current limits.
+        '''
+        for line, x, y in zip(self.lines, self._x, self._y):
+            line.set_data(x.view(), y.view())
+
+        canvas = self.fig.canvas
+        if self._stale or self._background is None:
+            self._rescale()
+            # Redraws everything except the lines and saves the background
+            canvas.draw()
+            self.redraws += 1
+        else:
+            canvas.restore_region(self._background)
+
+        for line in self.lines:
+            self.ax.draw_artist(line)
+
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+    def save(self, filename, **kwargs):
+        '''
+        Saves the chart with its current data (see save)
+        '''
+        for line in self.lines:
+            line.set_animated(False)
+        try:
+            plotting.save(filename, fig=self.fig, **kwargs)
+        finally:
+            for line in self.lines:
+                line.set_animated(True)
+
+    def _rescale(self):
+        '''
+        Sets the axes limits to the data range plus the margin
+        '''
+        limits = []
+        for buffers, convert in ((self._x, self.ax.convert_xunits), 
+                                 (self._y, self.ax.convert_yunits)):
+            # Limits are set in axis units (e.g., dates as numbers)
+            views = [np.asarray(convert(buffer.view()), dtype=float) 
+                     for buffer in buffers if len(buffer)]
+            if not views:
+                return
+
+            low = min(np.nanmin(view) for view in views)
+            high = max(np.nanmax(view) for view in views)
+            pad = (high - low) * self.margin or 0.5
+            limits.append((low, high, pad))
+
+        (x0, x1, x_pad), (y0, y1, y_pad) = limits
+        # Streams grow to the right, so the x room is only added there
+        self.ax.set_xlim(x0, x1 + x_pad)
+        self.ax.set_ylim(y0 - y_pad, y1 + y_pad)
+        self._stale = False
+
+    def _on_draw(self, event):
+        '''
+        Saves the figure without the lines after every full draw
+        '''
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+
+
+class _RingBuffer:
+    '''
+    Fixed size buffer of the last capacity values. Values are stored twice
+    (in both halves of an array of size 2 * capacity), so the last values
+    are always a contiguous view without copying.
+
+    Numbers are stored as floats. Dates and time deltas keep the datetime64 
+    (or timedelta64) type of the first values added, other types raise a 
+    TypeError.
+    '''
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.storage = np.full(2 * capacity, np.nan)
+        self.end = 0
+        self.size = 0
+        self._typed = False
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, values):
+        '''
+        Adds values to the end of the buffer
+        '''
+        values = self._cast(np.asarray(values)[-self.capacity:])
+        n = len(values)
+
+        # Positions of the values (wrapping around the first half)
+        index = (self.end + np.arange(n)) % self.capacity
+        self.storage[index] = values
+        self.storage[index + self.capacity] = values
+
+        self.end = (self.end + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def view(self):
+        '''
+        Returns the values in order (oldest first) as a view
+        '''
+        start = self.end - self.size + self.capacity
+        return self.storage[start:start + self.size]
+
+    def _cast(self, values):
+        '''
+        Converts values to the storage type (set by the first values)
+        '''
+        kind = values.dtype.kind
+        # Objects like datetime.datetime or pandas timestamps
+        if kind == 'O':
+            try:
+                values = values.astype('datetime64[us]')
+            except (TypeError, ValueError):
+                raise TypeError('Values must be numbers or dates, not %s' % 
+                                type(values[0]).__name__)
+            kind = 'M'
+        elif kind not in 'biufmM':
+            raise TypeError('Values must be numbers or dates, not %s' % values.dtype)
+
+        if not self._typed and len(values):
+            if kind in 'mM':
+                self.storage = np.full(2 * self.capacity, 'NaT', dtype=values.dtype)
+            self._typed = True
+
+        storage = self.storage.dtype.kind
+        if (kind in 'mM' or storage in 'mM') and kind != storage:
+            raise TypeError('Cannot add %s values to a buffer of %s values' % 
+                            (values.dtype, self.storage.dtype))
+        return values
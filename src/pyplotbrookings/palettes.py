@@ -0,0 +1,132 @@
+'''
+Brookings brand color palettes.
+
+Only the standard library is used at import time, so palettes and colors 
+can be looked up without loading matplotlib.
+'''
+_palettes = {
+        # Categorical
+        '1-color A': ['#003A70'],
+        '1-color B': ['#0061A0'],
+        '2-color A': ('#003A70', '#FF9E1B'),
+        '2-color B': ('#003A70', '#8BB8E8'),
+        '3-color A': ('#003A70', '#FF9E1B', '#8BB8E8'),
+        '3-color B': ('#003A70', '#FF9E1B', '#B1B3B3'),
+        '4-color A': ('#003A70', '#FF9E1B', '#8BB8E8', '#F2CD00'),
+        '4-color B': ('#003A70', '#FF9E1B', '#8BB8E8', '#B1B3B3'),
+        '5-color': ('#003A70', '#FF9E1B', '#8BB8E8', '#F2CD00', '#B1B3B3'),
+        '6-color': ('#003A70', '#FF9E1B', '#8BB8E8', '#F2CD00', '#EF6A00', '#B1B3B3'),
+                
+        'sequential (single hue)': ('#00649f', '#0f78ba', '#1c8ad6',  '#2e97ea', '#56adf6', '#87c4fe', '#bcdefb'),
+        'sequential (two hues)' : ('#00649f', '#2a7a8b', '#559077', '#80a662', '#aabd4e', '#d4d33a', '#ffe926'),
+        'diverging': ('#ed3a35', '#ee7673', '#eeb3b1', '#efefef', '#adc9e2', '#6aa4d6', '#287ec9'),
+        'vivid blue palette': ('#023147', '#0061A0', '#287EC9', '#66ACED', '#CAE1FA'),
+        'orange palette': ('#EF6A00', '#FF851A', '#FF9E1B', '#FFB24D', '#FEC87F'),
+        'paired': ('#003A70', '#326295', '#EF6A00', '#FF9E1B', '#418FDE', '#8BB8E8', '#E0BB00', '#FFDD00', '#949494', '#B1B3B3'),
+        
+        # Additional palettes
+        'pos-neg A': ('#5CA632', '#CD1A1C'),
+        'pos-neg B': ('#5CA632', '#F5CC00', '#CD1A1C'),
+        
+        '2-political A': ('#ed3a35', '#287ec9'),
+        '2-political B': ('#ee7673', '#6aa4d6'),
+        '3-political A': ('#ed3a35', '#287ec9', '#f2cd00'),
+        '3-political B': ('#ee7673', '#6aa4d6', '#f1d850'),
+        
+        # Extended palettes
+        'brand blue': ('#022A4E', '#003A70', '#1A4E80', '#326295', '#517EAD', '#7098C3', '#8DADD0', '#A8BDD5', '#DDE5ED'),
+        'vivid blue': ('#023147', '#004B6E', '#0061A0', '#1372BA', '#287EC9', '#418FDE', '#66ACED', '#8BB8E8', '#CAE1FA'),
+        'teal': ('#032B30', '#09484F', '#116470', '#1C8090', '#2A9AAD', '#3EB2C6', '#59C6DA', '#7CD9EA', '#A6E9F5'),
+        'green': ('#1A3404', '#294D0A', '#33660F', '#45821B', '#5CA632', '#7DBF52', '#9CD674', '#BDED9D', '#DEF5CC'),
+        'yellow': ('#594C09', '#877414', '#C7A70A', '#E0BB00', '#F2CD00', '#FFDD00', '#FFE926', '#FFF170', '#FFF9C2'),
+        'orange': ('#663205', '#994B08', '#B85B0A', '#EF6A00', '#FF851A', '#FF9E1B', '#FFB24D', '#FEC87F', '#FBD9A5'),
+        'red': ('#660507', '#A00D11', '#CD1A1C', '#E22827', '#ED3A35', '#F75C57', '#F98B83', '#FCB0AA', '#FDD7D4'),
+        'magenta': ('#510831', '#8D1655', '#A82168', '#BF317B', '#D2468E', '#E160A2', '#EC81B7', '#F5A8CF', '#FAD4E7'),
+        'purple': ('#3E2C72', '#533C91', '#6A50AD', '#7C60BF', '#8E72D0', '#9C82D9', '#B59DEA', '#D0BEF5', '#E9E0FC'),
+        'gray': ('#191919', '#404040', '#666666', '#757575', '#949494', '#B1B3B3', '#CCCCCC', '#E6E6E6', '#F2F2F2'),
+    }
+
+# Functions called with the palette name when make_palette() adds a palette
+_palette_listeners = []
+
+
+def get_palette(name, list_supported=False):
+    '''
+    Given a palette name returns a tuple of hexcolor
+    palette colors
+
+    name (str): The palette name.
+
+    list_supported (bool): If true list all supported palette 
+        names (see below).
+
+    Complete list of valid palette names:
+        '1-color A', '1-color B', '2-color A', '2-color B', '3-color A', '3-color B', '4-color A',
+        '4-color B', '5-color', '6-color', 'sequential (single hue)', 'sequential (two hues)', 'diverging', 
+        'pos-neg A', 'pos-neg B', '2-political A', '2-political B', '3-political A', '3-political B', 
+        'brand blue', 'vivid blue', 'teal', 'green', 'yellow', 'orange', 'red', 'magenta', 'purple', 'gray'
+    '''    
+    supported_palettes = list(_palettes.keys())
+
+    # Return all palette names if 
+    if list_supported:
+        return supported_palettes
+    
+    if name not in supported_palettes:
+        raise Exception(
+            f'"{name}" is not a valid color palette. \
+                Try one of the following: {supported_palettes}')
+    
+    return _palettes[name]
+
+
+def get_color(name):
+    '''
+    Returns the hexcolor value of a named Brookings color
+    
+    name (str): The name of the Brookings color 
+                (e.g., 'brookings blue' or 'yellow 50')
+    '''
+    # Cleaning string
+    name = name.lower()
+    
+    # Checking for named colors
+    if name == 'brookings blue':
+        return '#003A70'
+    
+    if name == 'cool gray':
+        return '#B1B3B3'
+    
+    # Accessing color from color palettes
+    else:
+        color = ' '.join(name.split(' ')[0:-1])
+        # Converting string number to index
+        value = int((int(name.split(' ')[-1]) / -10) + 9)
+        
+        return get_palette(color)[value]
+    
+    
+def make_palette(colors, n, name):
+    '''
+    Given a list of colors and number of segments, creates a multi-hue 
+    sequential palette of n colors.
+    
+    colors (array): A list like object of colors to be used for the color palette
+    
+    n (int): Number of colors in the final palette (n > len(colors))
+    
+    name (str): Name of the palette (for access later on)
+    '''
+    # Matplotlib is only needed (and imported) when making palettes
+    from matplotlib.colors import LinearSegmentedColormap, to_hex
+
+    # Interpolating between listed colors
+    cmap = LinearSegmentedColormap.from_list("", colors, N=n)
+    palette = tuple([to_hex(cmap(i)) for i in range(n)])
+    
+    # Adding the named palette
+    _palettes[name] = palette
+
+    # Letting loaded modules update anything built from the palette
+    for listener in _palette_listeners:
+        listener(name)
@@ -0,0 +1,924 @@
+'''
+Figure helpers: Brookings titles, notes, logos, figure sizes, and saving.
+'''
+import matplotlib as mpl
+import matplotlib.colors
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import io
+import os
+import re
+import sys
+
+
+def _use_headless_backend():
+    '''
+    Selects the non-interactive Agg backend when no display is available 
+    and no backend was chosen (saves matplotlib from probing GUI toolkits)
+    '''
+    if 'matplotlib.pyplot' in sys.modules or os.environ.get('MPLBACKEND'):
+        return
+
+    # Only select a backend when none was configured (e.g., in matplotlibrc)
+    backend = dict.get(mpl.rcParams, 'backend')
+    if backend is not getattr(mpl.rcsetup, '_auto_backend_sentinel', None):
+        return
+
+    if sys.platform.startswith('linux') and not (
+            os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        mpl.use('Agg')
+
+
+_use_headless_backend()
+
+import matplotlib.pyplot as plt
+import matplotlib.image as mpimg
+
+from .palettes import get_palette
+from .colors import get_text_colors
+from .profiling import phase, count
+from .text import text_width, wrap_text
+
+# Titles and notes are wrapped at their widest measure unhinted and hinted at
+# the Brookings DPIs and matplotlib's 100 and 150 DPI defaults (hinting makes
+# text wider or narrower depending on the font and DPI), so lines fit at any
+# DPI in practice
+_wrap_dpi = (None, 72, 100, 150, 300)
+
+
+def add_title(title=None, subtitle=None, tag=None, v_pad=0, h_pad=0, text_pad=0, fig=None):
+    '''
+    Adds titles to the current figure (or fig).
+
+    title (str): The title of the plot. Title should be short
+
+    subtitle (str): The subtitle of the plot. Subtitle can be longer and
+         add description to the figure 
+
+    tag (str): The figure name/number plotted above the titles
+
+    v_pad (float): Vertical padding, a number specifying additional amount of 
+        spacing to add between the top of the figure and the first title.
+
+    h_pad (float): Horizontal padding, the amount of additional space to offset 
+        the title text in the x direction.
+
+    text_pad (float): Number specifying additional amount of spacing to add
+        between lines of text.
+
+    fig: The matplotlib figure to add titles to. Defaults to the current 
+        pyplot figure.
+    '''
+    fig = _get_figure(fig)
+    with phase('add_title', fig):
+        _add_title(_Layout(fig), title, subtitle, tag, v_pad, h_pad, text_pad)
+
+
+def _add_title(layout, title, subtitle, tag, v_pad, h_pad, text_pad):
+    '''
+    Places the title text using a figure layout (see add_title)
+    '''
+    fig = layout.fig
+    # Get the font size
+    font_size = mpl.rcParams['font.size']
+    # Set starting y coords
+    x = layout.coords('left') + h_pad/100
+    y = layout.coords('top') + v_pad/100
+    # Font size to pad
+    text_pad = (0.47 + text_pad/100) * font_size
+    # Text is wrapped at the right edge of the figure (in points)
+    width = (1 - x) * fig.get_figwidth() * 72
+    
+    # Add some blank space padding
+    layout.add(fig.text(x, y, ' ', size=text_pad+4*text_pad))
+
+    if subtitle:
+        y = layout.coords('top')
+        subtitle = wrap_text(subtitle, width, size=0.833*font_size, dpi=_wrap_dpi)
+        layout.add(fig.text(x, y, subtitle, size=0.833*font_size))
+        # Increment next titles vertical offset if text was added
+        y = layout.coords('top')
+        layout.add(fig.text(x, y, ' ', size=1.5*text_pad))
+        
+    if title:    
+        y = layout.coords('top')
+        title = wrap_text(title, width, size=font_size, weight='bold', dpi=_wrap_dpi)
+        layout.add(fig.text(x, y, title, size=font_size, weight='bold'))
+        y = layout.coords('top')
+        layout.add(fig.text(x, y, ' ', size=2*font_size))
+
+    if tag:
+        y = layout.coords('top')
+        right = layout.coords('right') - x
+        # Adding the tag in a seprate subplot 
+        # Figure annotations can be finicky so a new subplot is easiest way to add them   
+        ax = fig.add_axes([x, y, right, 0.01], zorder=1)
+        
+        
+        ax.set_ylim(0.9, 1.5)
+        # Adding the tag and line at the top of the figure
+        ax.annotate(tag + '   ', xytext=(0, 1.25), xy=(1, 1.5), 
+                    fontsize=0.75*font_size, weight="light", color='#666666',
+                    arrowprops=dict(arrowstyle="-", linewidth=0.5, color='#666666'))
+        
+        # Turning off axis so only text is displayed
+        ax.axis('off')
+
+
+def add_notes(*args, v_pad=-5, h_pad=0, text_pad=0, wrap=True, fig=None):
+    '''
+    Adds footnotes to the current figure (or fig).
+
+    *args (str): String arguments containing text to place at the bottom of 
+        the figure. Any text before the first colon will be bolded.
+
+    v_pad (float): Vertical padding, a number specifying additional amount of
+        spacing to add between the bottom of the figure and the first note.
+
+    h_pad (float): Horizontal padding, the amount of additional space to offset 
+        the notes text in the x direction.
+
+    text_pad (float): Number specifying additional amount of spacing to add
+        between lines of text.
+
+    wrap (bool): Break notes into lines at the right edge of the figure
+
+    fig: The matplotlib figure to add notes to. Defaults to the current 
+        pyplot figure.
+    '''
+    fig = _get_figure(fig)
+    with phase('add_notes', fig):
+        _add_notes(_Layout(fig), args, v_pad, h_pad, text_pad, wrap)
+
+
+def _add_notes(layout, notes, v_pad, h_pad, text_pad, wrap=True):
+    '''
+    Places the footnote text using a figure layout (see add_notes)
+    '''
+    fig = layout.fig
+    # Get the font size
+    font_size = mpl.rcParams['font.size']  
+
+    # Set starting y coords
+    x = layout.coords('left') + h_pad/100
+    y = layout.coords('bottom') + v_pad/100
+    # Pad font size
+    text_pad = (2 + text_pad/100) * font_size
+    # Notes are wrapped at the right edge of the figure (in points)
+    width = (1 - x) * fig.get_figwidth() * 72
+
+    for text in notes:
+        # Add some blank space padding
+        layout.add(fig.text(x, y, ' ', size=text_pad))
+        
+        # Decrease y value
+        y = layout.coords('bottom')
+        
+        # If there is a colon, bold the text prior to the colon
+        if ":" in text:
+            bold_text = text.split(":")[0] + ":"
+            text = ":".join(text.split(":")[1:])
+        else:
+            bold_text = ''
+
+        if wrap:
+            # The first line starts after the bold text
+            indent = text_width(bold_text, size=0.75*font_size, weight='bold', dpi=_wrap_dpi)
+            text = wrap_text(text, width, size=0.75*font_size, indent=indent, dpi=_wrap_dpi)
+
+        # Add any bold text to the beginning of the footnote text
+        txt = layout.add(fig.text(x, y,
+                    bold_text, size=0.75*font_size, color="#666666", weight='bold', va='top'))
+        
+        # If there are line feeds, add this extra text below the first line
+        if '\n' in text:
+            # Extra paragraphs of text
+            extra_text = '\n'+'\n'.join(text.splitlines()[1:])
+            # Main text is now just the first line
+            text = text.splitlines()[0]
+            layout.add(fig.text(x, y,
+                    extra_text, size=0.75*font_size, color="#666666", va='top'))
+        
+        # off set in x direction from bold text on first line
+        x_off = layout.coords('right', obj=txt)
+        # Add the non bold text to the bottom of the figure
+        layout.add(fig.text(x_off, y,
+                    text, size=0.75*font_size, color="#666666", va='top'))
+
+        # Increment the offset for the next set of text
+        y = layout.coords('bottom')
+
+
+def add_chrome(title=None, subtitle=None, tag=None, notes=(), logo=None, dpi=None, fig=None):
+    '''
+    Adds titles, notes, and a logo to the current figure (or fig) in a single layout
+    pass. The figure is only measured once, so this is faster than calling
+    add_title(), add_notes(), and add_logo() separately while placing the
+    text in the same positions.
+
+    title (str): The title of the plot (see add_title)
+
+    subtitle (str): The subtitle of the plot (see add_title)
+
+    tag (str): The figure name/number plotted above the titles (see add_title)
+
+    notes (list): Notes to place at the bottom of the figure (see add_notes)
+
+    logo (str): Logo path or abbreviation of a supported logo (see add_logo)
+
+    dpi (str or float): The DPI the figure will be saved at, used to 
+        downsample the logo (see add_logo)
+
+    fig: The matplotlib figure to add to. Defaults to the current pyplot 
+        figure.
+    '''
+    fig = _get_figure(fig)
+    with phase('add_chrome', fig):
+        layout = _Layout(fig)
+
+        if title or subtitle or tag:
+            _add_title(layout, title, subtitle, tag, v_pad=0, h_pad=0, text_pad=0)
+
+        if notes:
+            _add_notes(layout, notes, v_pad=-5, h_pad=0, text_pad=0)
+
+        if logo:
+            add_logo(logo, dpi=dpi, fig=fig)
+
+
+def add_logo(logo_path, offsets=(0, 0), scale=0.25, list_supported=False, dpi=None, fig=None):
+    '''
+    Adds a logo to the bottom right of a figure
+
+    logo_path (str): Path to a local file path or an abbreviation for one
+         of the package supported logos (see documentation below for more 
+         details on supported logos)
+
+    offsets (tuple): Tuple with the X, Y offsets for a figure (in fraction 
+        of the figure size)
+
+    scale (float): Scale factor to set the logo size
+
+    list_supported (bool): If true return a list of all valid logo 
+        abbreviations (see below)
+
+    dpi (str or float): The DPI the figure will be saved at (retina, print, 
+        screen, or a number). If given, the logo is downsampled to the 
+        resolution it is displayed at instead of the full image resolution.
+
+    fig: The matplotlib figure to add the logo to. Defaults to the current 
+        pyplot figure.
+
+    Complete list of supported logos abbreviations:
+        bc: Brown Center
+        bi: Bass Initiative on Innovation and Placemaking
+        brookings: Brookings Institution
+        cc: China Center
+        ccf: Center on Children and Families
+        ceaps: Center for East Asia Policy Studies
+        cepm: Center for Effective Policy Management 
+        chp: Center for Health Policy
+        cmep: Center for Middle Eastern Policy
+        crm: Center on Regulation and Markets
+        csd: Center for Sustainable Development
+        cti: Center for Technology Innovation
+        cue: Center for Universal Education
+        cuse: Center on United States and Europe
+        es: Economic Studies 
+        fp: Foreign Policy
+        global: Global Studies 
+        gs: Governance Studies
+        hc: Hutchins Center
+        metro: Metropolitan Policy Studies
+        thp: The Hamilton Project
+    '''
+    # List of supported logos
+    supported_logos = ["bc", "bi", "brookings", "cc", "ccf", "ceaps", "cepm", "chp", "cmep", "crm", "csd",
+                       "cti", "cue", "cuse", "es", "fp", "global", "gs", "hc", "metro", "thp"]
+    
+    if list_supported:
+        return supported_logos
+
+    # Set up the subplot coordinates
+    dx, dy = offsets
+    font_size = mpl.rcParams['font.size']
+    # Map of logo position names to coordinates
+    logo_loc = [0.65+dx, -0.12+dy-font_size*0.006, scale, 0.2]
+
+    # Updating string to directory path if using a supported logo
+    if logo_path in supported_logos:
+        path = os.path.join(os.path.dirname(__file__), 'logos')
+        logo_path = os.path.join(path, logo_path + '.png')
+
+    try:
+        # Read the image (decoded logos are cached by path and modified time)
+        mtime = os.path.getmtime(logo_path)
+        logo = _read_logo(logo_path, mtime)
+
+    except FileNotFoundError:
+        # Throw error listing valid logo names
+        raise Exception(f'No such file or directory: " {logo_path}. Check your \
+                        path or try one of the following: {supported_logos}')
+
+    # Get current figure
+    fig = _get_figure(fig)
+
+    if dpi is not None:
+        # Pixel size of the logo axis at the target DPI
+        width, height = fig.get_size_inches() * logo_loc[2:] * _get_dpi(dpi)
+        # The logo keeps its aspect ratio inside of the axis
+        factor = min(width / logo.shape[1], height / logo.shape[0])
+
+        if factor < 1:
+            logo = _scaled_logo(logo_path, mtime, max(1, round(logo.shape[1] * factor)),
+                                max(1, round(logo.shape[0] * factor)))
+    # Add an axis for the logo plot
+    ax = fig.add_axes(logo_loc, zorder=1)
+
+    # Add logo to new axis and turn off axis labeling
+    ax.imshow(logo, cmap='viridis')
+    ax.axis('off')
+
+
+@functools.lru_cache(maxsize=32)
+def _read_logo(logo_path, mtime):
+    '''
+    Returns the decoded image of a logo file. Results are cached (the 
+    modified time is part of the cache key so edited files are re-read).
+    '''
+    with phase('decode_logo'):
+        logo = mpimg.imread(logo_path)
+    # Cached arrays are shared so they are made read only
+    logo.setflags(write=False)
+    return logo
+
+
+@functools.lru_cache(maxsize=64)
+def _scaled_logo(logo_path, mtime, width, height):
+    '''
+    Returns a logo image downsampled to width x height pixels. Results
+    are cached.
+    '''
+    from PIL import Image
+
+    logo = _read_logo(logo_path, mtime)
+    # PNGs are decoded as floats, resample them as 8 bit images
+    if logo.dtype.kind == 'f':
+        logo = (logo * 255).round().astype(np.uint8)
+
+    with phase('scale_logo'):
+        image = Image.fromarray(np.ascontiguousarray(logo))
+        logo = np.asarray(image.resize((width, height), Image.LANCZOS))
+    logo.setflags(write=False)
+    return logo
+
+def view_palette(name, ax=None):
+    '''
+    Given a color palette (base or extended) creates a preview of the palette
+
+    ax: Optional matplotlib axis to draw the preview on. If None the preview
+        is drawn on the current pyplot axis and shown.
+    '''
+    show = ax is None
+    if ax is None:
+        ax = plt.gca()
+
+    # All valid color maps
+    palette = get_palette(name)
+    
+    # Cast color to an array
+    palette = np.array(palette)
+    # Text color to use on top of each palette color
+    text_colors = get_text_colors(palette)
+    
+    # Number of columns in the final figure 
+    cols = int(np.ceil(len(palette)/2))
+    
+    # Reshape the data into a 2D image
+    data = np.arange(2*cols).reshape(2, cols)
+    
+    # Append white "squares" to the end of the color map 
+    palette_extended = np.append(palette, np.repeat('#FFFFFF', len(palette) % 2))
+    
+    # Create a color map
+    cmap = mpl.colors.LinearSegmentedColormap.from_list("", palette_extended)
+    # Plot the image
+    ax.imshow(data, cmap=cmap)
+    
+    # Counter for the order of the colors
+    k = 0
+    for i in range(data.shape[0]):
+        for j in range(data.shape[1]):
+            
+            # If the palette is white breakout of labeling the colors
+            if k >= len(palette):
+                break
+
+            # Get the correct text color
+            color = text_colors[k]
+
+            # Plot text on top of the palette color with the correct color
+            # showing the hexcode and palette order number
+            ax.text(j, i, str(k + 1) + '\n' + palette[k].upper(),
+                    ha="center", va="center", color=color)
+            # Increase the counter
+            k += 1
+    
+    ax.axis('off')
+    if show:
+        plt.show()
+
+def figure(size, **kwargs):
+    '''
+    Create a figure using one of the standard Brookings sizes (small, medium, or large).
+    Keyword arguments can be passed to pyplots plt.figure() function.
+    '''
+    return plt.figure(figsize=_get_size(size), **kwargs)
+
+
+def new_figure(size='medium', **kwargs):
+    '''
+    Create a figure using one of the standard Brookings sizes (small, medium,
+    or large) without pyplot. The figure is drawn on its own Agg canvas and 
+    isn't tracked by pyplot, so it can be built and saved from any thread
+    (pass it to the helpers with fig=). Keyword arguments are passed to the 
+    matplotlib Figure class.
+    '''
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=_get_size(size), **kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _get_size(size):
+    '''
+    Helper function converting a named Brookings figure size (small, medium,
+    large) to its size in inches. Tuples are returned unchanged.
+    '''
+    if type(size) is str:
+        sizes = {'small': (3.25, 2), 'medium':(6.5, 4), 'large':(9, 6.5)}
+
+        # If name is invalid throw an error
+        if size not in sizes.keys():
+            raise Exception("Size must be one of 'small', 'medium', or 'large'")
+
+        size = sizes[size]
+
+    return size
+
+
+def _get_figure(fig):
+    '''
+    Helper function returning fig, or the current pyplot figure if None
+    '''
+    return plt.gcf() if fig is None else fig
+
+
+def save(filename, dpi=None, fig=None, compact=False, close=False, **kwargs):
+    '''
+    Save a plot using standard Brookings DPI values (retina, print, screen)
+    Keyword arguments can be passed to pyplots plt.savefig() function.
+    The current pyplot figure is saved unless a figure is passed as fig.
+
+    close (bool): Close the figure after saving it. Figures from a figure 
+        pool (see pool.acquire) are returned to the pool and must not be
+        used afterwards.
+
+    compact (bool): Make vector outputs (svg, pdf) smaller and 
+        reproducible. PDFs use maximum compression and SVG files are 
+        minified (shared styles, rounded coordinates, and no whitespace). 
+        Matplotlib already embeds only the used glyphs either way.
+        Returns the size of the output in bytes.
+    '''
+    if not dpi:
+        dpi = 'figure'
+
+    else:
+        dpi = _get_dpi(dpi)
+    
+    fig = _get_figure(fig)
+    try:
+        with phase('save', fig):
+            # savefig measures the tight bounding box before drawing
+            count('tight_bbox', fig)
+
+            if compact:
+                return _save_compact(fig, filename, dpi=dpi, bbox_inches='tight', **kwargs)
+
+            fig.savefig(filename, dpi=dpi, bbox_inches='tight', **kwargs)
+    finally:
+        _close_figure(fig, close)
+
+
+def _close_figure(fig, close):
+    '''
+    Closes a figure after saving it (see save)
+    '''
+    if not close:
+        return
+
+    pool = getattr(fig, '_figure_pool', None)
+
+    if pool is not None:
+        pool.release(fig)
+    else:
+        plt.close(fig)
+
+
+# Parameters for compact vector outputs: maximum PDF compression, simplified
+# paths, and deterministic SVG ids (fonts are kept as set by the theme, 
+# matplotlib embeds subsets of the used glyphs by default)
+_compact_rc = {'pdf.compression': 9, 'svg.hashsalt': 'pyplotbrookings', 'path.simplify': True}
+
+
+def _save_compact(fig, filename, **kwargs):
+    '''
+    Saves a figure with the compact vector parameters, returns the output 
+    size in bytes (see save)
+    '''
+    fmt = kwargs.get('format')
+    if fmt is None and isinstance(filename, (str, os.PathLike)):
+        fmt = os.path.splitext(filename)[1].lstrip('.') or None
+    if fmt is None:
+        fmt = mpl.rcParams['savefig.format']
+    kwargs['format'] = fmt = fmt.lower()
+
+    # Leave out the creation date so unchanged figures give identical files
+    if fmt in ('svg', 'pdf'):
+        kwargs.setdefault('metadata', {'Date': None} if fmt == 'svg' else {'CreationDate': None})
+
+    buffer = io.BytesIO()
+    with mpl.rc_context(_compact_rc):
+        fig.savefig(buffer, **kwargs)
+
+    data = buffer.getvalue()
+    if fmt == 'svg':
+        data = _minify_svg(data)
+
+    if isinstance(filename, (str, os.PathLike)):
+        with open(filename, 'wb') as f:
+            f.write(data)
+    else:
+        filename.write(data)
+
+    return len(data)
+
+
+def _minify_svg(data):
+    '''
+    Returns a smaller version of a matplotlib SVG file. Repeated inline 
+    styles (e.g., of grid lines and ticks) are replaced by CSS classes, 
+    coordinates (and the view box, so it matches the rounded size) are 
+    rounded to 1/100 of a point, and comments and indentation are removed.
+    '''
+    svg = data.decode('utf-8')
+
+    # Comments (matplotlib labels text and glyphs with them)
+    svg = re.sub(r'<!--.*?-->', '', svg, flags=re.S)
+
+    # Coordinates only need a precision of 1/100 of a point (transforms are
+    # kept since they scale glyphs)
+    def round_numbers(match):
+        value = re.sub(r'-?\d+\.\d+', _short_float, match.group(2))
+        # Path data doesn't need line breaks
+        return f'{match.group(1)}="{" ".join(value.split())}"'
+
+    svg = re.sub(r'\b(d|x|y|width|height|points|viewBox)="([^"]*)"', round_numbers, svg)
+
+    # Styles used more than once become classes
+    styles = {}
+    for style in re.findall(r' style="([^"]*)"', svg):
+        styles[style] = styles.get(style, 0) + 1
+    classes = {style: f's{i}' for i, style in enumerate(s for s, n in styles.items() if n > 1)}
+
+    if classes:
+        svg = re.sub(r' style="([^"]*)"', 
+                     lambda m: f' class="{classes[m.group(1)]}"' if m.group(1) in classes else m.group(0), 
+                     svg)
+        rules = ''.join(f'.{name}{{{style}}}' for style, name in classes.items())
+        svg = svg.replace('</style>', rules + '</style>', 1)
+
+    # Indentation between tags
+    svg = re.sub(r'>\s+<', '><', svg)
+    return svg.encode('utf-8')
+
+
+def _short_float(match):
+    '''
+    Formats a number with at most two decimals (see _minify_svg)
+    '''
+    value = f'{float(match.group()):.2f}'.rstrip('0').rstrip('.')
+    return '0' if value == '-0' else value
+
+
+class Report:
+    '''
+    A multi-page PDF of figures. The fonts of all pages are embedded once,
+    as a single subset of the glyphs used by every figure, so reports are 
+    much smaller than the separate PDFs of their figures.
+
+        with ppb.Report('report.pdf') as report:
+            for chart in charts:
+                ...
+                report.add(fig)
+
+        print(report.size)
+
+    filename: Output path or binary file object
+
+    dpi (str or float): Brookings DPI name (retina, print, screen) or number 
+        used for raster content (e.g., logos)
+
+    compact (bool): Use the compact vector parameters (see save) while 
+        adding pages and writing the fonts
+    '''
+    def __init__(self, filename, dpi='print', compact=True):
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        self.filename = filename
+        self.dpi = _get_dpi(dpi)
+        self.size = None
+        self._rc = _compact_rc if compact else {}
+        with mpl.rc_context(self._rc):
+            metadata = {'CreationDate': None} if compact else None
+            self._pages = PdfPages(filename, metadata=metadata)
+
+    def add(self, fig=None, **kwargs):
+        '''
+        Adds a figure (by default the current pyplot figure) as a page. 
+        Keyword arguments are passed to the matplotlib savefig() function.
+        '''
+        fig = _get_figure(fig)
+        with phase('report_page', fig):
+            count('tight_bbox', fig)
+            with mpl.rc_context(self._rc):
+                self._pages.savefig(fig, dpi=self.dpi, bbox_inches='tight', **kwargs)
+
+    def close(self):
+        '''
+        Writes the fonts and closes the PDF. Returns the size in bytes.
+        '''
+        if self.size is None:
+            with mpl.rc_context(self._rc):
+                self._pages.close()
+
+            if isinstance(self.filename, (str, os.PathLike)):
+                self.size = os.path.getsize(self.filename)
+            else:
+                self.size = self.filename.tell()
+        return self.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def save_all(filename=None, formats=('png',), dpi=('screen',), parallel=False, fig=None, 
+             close=False, **kwargs):
+    '''
+    Save the current figure in several formats and Brookings DPI values. 
+    Raster images (png, jpg, tif, webp) are drawn once per DPI (cropped to
+    the tight bounding box measured at that DPI, so they are identical to 
+    save), then encoded for each format (optionally in parallel). Vector 
+    formats (svg, pdf, eps) are saved once at the highest DPI. Keyword 
+    arguments are passed to pyplots plt.savefig() function.
+
+    Saving several raster formats at a DPI is faster than separate save() 
+    calls (the figure is only drawn once). Saving several DPIs costs about 
+    as much as separate calls, since each DPI is drawn.
+
+    filename (str): Output path without the extension. Files are named 
+        '<filename>.<format>', or '<filename>-<dpi>.<format>' for raster
+        formats when more than one DPI is saved. If None, the outputs are 
+        returned as bytes.
+
+    formats (tuple): Output formats (e.g., ('png', 'svg', 'pdf'))
+
+    dpi (tuple): Brookings DPI names (retina, print, screen) or numbers
+
+    parallel (bool or int): Encode raster images in a thread pool (an int
+        sets the number of threads)
+
+    fig: The matplotlib figure to save. Defaults to the current pyplot figure.
+
+    close (bool): Close the figure after saving it (see save)
+
+    Returns a dictionary mapping (format, dpi) to the saved path or bytes
+    '''
+    fig = _get_figure(fig)
+    try:
+        with phase('save_all', fig):
+            return _save_all(fig, filename, formats, dpi, parallel, **kwargs)
+    finally:
+        _close_figure(fig, close)
+
+
+def _save_all(fig, filename, formats, dpi, parallel, **kwargs):
+    '''
+    Saves a figure in several formats and DPI values (see save_all)
+    '''
+    dpis = [dpi] if isinstance(dpi, (str, int, float)) else list(dpi)
+    formats = [fmt.lower().lstrip('.') for fmt in formats]
+
+    # Hinted text is wider at low DPI, so the tight bounding box is measured
+    # at each DPI (vector outputs share the one of the highest DPI)
+    pad_inches = kwargs.pop('pad_inches', None)
+    top_dpi = max(dpis, key=_get_dpi)
+
+    def target(fmt, name):
+        if filename is None:
+            return io.BytesIO()
+        suffix = '' if len(dpis) == 1 or name is None else f'-{name}'
+        return f'{filename}{suffix}.{fmt}'
+
+    outputs = {}
+    raster_formats = [fmt for fmt in formats if fmt in _raster_formats]
+    encodes = []
+    # Images by DPI value (names with the same value share a draw)
+    images = {}
+    for name in dpis:
+        value = _get_dpi(name)
+        if not raster_formats:
+            break
+
+        # Draw the figure once for all raster formats at this DPI
+        if value not in images:
+            bbox = _tight_bbox(fig, value, pad_inches)
+            images[value] = _render_rgba(fig, bbox, value, **kwargs)
+        image = images[value]
+        for fmt in raster_formats:
+            encodes.append((image, fmt, value, (fmt, name), target(fmt, name)))
+
+    if parallel and len(encodes) > 1:
+        workers = None if parallel is True else parallel
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda job: _encode_image(*job[:3], job[4]), encodes)
+            for job, output in zip(encodes, results):
+                outputs[job[3]] = output
+    else:
+        for job in encodes:
+            outputs[job[3]] = _encode_image(*job[:3], job[4])
+
+    # Vector formats don't depend on the DPI (except for embedded images)
+    vector_formats = [fmt for fmt in formats if fmt not in _raster_formats]
+    if vector_formats:
+        bbox = _tight_bbox(fig, _get_dpi(top_dpi), pad_inches)
+    for fmt in vector_formats:
+        out = target(fmt, None)
+        with phase('save_vector', fig):
+            fig.savefig(out, format=fmt, dpi=_get_dpi(top_dpi), bbox_inches=bbox, **kwargs)
+        outputs[(fmt, top_dpi)] = out.getvalue() if filename is None else out
+
+    return outputs
+
+
+# Raster formats saved from a single draw by save_all (and PIL format names)
+_raster_formats = {'png': 'PNG', 'jpg': 'JPEG', 'jpeg': 'JPEG', 'tif': 'TIFF', 
+                   'tiff': 'TIFF', 'webp': 'WEBP'}
+
+
+def _tight_bbox(fig, dpi, pad_inches=None):
+    '''
+    Returns the padded tight bounding box of a figure in inches measured at
+    a DPI (as used by savefig(bbox_inches='tight'))
+    '''
+    if pad_inches is None:
+        pad_inches = mpl.rcParams['savefig.pad_inches']
+
+    count('tight_bbox', fig)
+
+    # Text is measured at the DPI it will be drawn at (like savefig)
+    figure_dpi = fig.dpi
+    fig.dpi = dpi
+    try:
+        # Layout engines (e.g., constrained layout) only run when drawing
+        if fig.get_layout_engine() is not None:
+            fig.draw_without_rendering()
+
+        bbox = fig.get_tightbbox(fig.canvas.get_renderer())
+    finally:
+        fig.dpi = figure_dpi
+
+    return bbox.padded(pad_inches)
+
+
+def _render_rgba(fig, bbox, dpi, **kwargs):
+    '''
+    Draws the bbox region of a figure at a DPI and returns it as an 
+    RGBA PIL image
+    '''
+    from PIL import Image
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    buffer = io.BytesIO()
+    with phase('draw_raster', fig):
+        fig.savefig(buffer, format='rgba', dpi=dpi, bbox_inches=bbox, **kwargs)
+
+    # Pixel size of the cropped figure (computed the way the Agg canvas does)
+    size = FigureCanvasAgg(Figure(figsize=bbox.size, dpi=dpi)).get_width_height()
+    return Image.frombuffer('RGBA', size, buffer.getbuffer(), 'raw', 'RGBA', 0, 1)
+
+
+def _encode_image(image, fmt, dpi, out):
+    '''
+    Encodes an RGBA PIL image to a file path or buffer. Returns the path or 
+    the encoded bytes.
+    '''
+    from PIL import Image
+
+    pil_format = _raster_formats[fmt]
+    with phase('encode_' + fmt):
+        if pil_format == 'JPEG':
+            # JPEGs have no transparency, composite onto a white background
+            background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+            image = Image.alpha_composite(background, image).convert('RGB')
+
+        image.save(out, format=pil_format, dpi=(dpi, dpi))
+    return out.getvalue() if isinstance(out, io.BytesIO) else out
+
+
+def _get_dpi(dpi):
+    '''
+    Helper function converting a named Brookings DPI (retina, print, 
+    screen) to its value. Numbers are returned unchanged.
+    '''
+    if type(dpi) is str:
+        dpi_dict = {"retina": 320, "print": 300, "screen": 72}
+
+        # If name is invalid throw an error
+        if dpi not in dpi_dict.keys():
+            raise Exception("DPI must be one of 'retina', 'print', or 'screen'")
+
+        dpi = dpi_dict[dpi]
+
+    return dpi
+
+
+def get_coords(loc, obj=None, fig=None):
+    '''
+    Helper function for getting plot coordinates (of the current pyplot 
+    figure unless fig is given)
+    '''
+    fig = _get_figure(fig)
+    # If passed an object get its coords
+    if obj is None:
+        count('tight_bbox', fig)
+        # Figure tight bbox is in inches, not display coords
+        bbox = fig.get_tightbbox(fig.canvas.get_renderer())
+        coords = bbox.get_points() / fig.get_size_inches()
+    # Otherwise get the figure coords
+    else:
+        bbox = obj.get_tightbbox(fig.canvas.get_renderer())
+        coords = fig.transFigure.inverted().transform(bbox)
+    
+    return {'left': coords[0, 0], 'right': coords[1, 0], 'bottom': coords[0, 1], 'top': coords[1, 1]}[loc]
+
+
+class _Layout:
+    '''
+    Running tight bounding box of a figure used to stack titles and notes.
+
+    The figure is measured once when the layout is created. Text added
+    through the layout is measured on its own and merged into the bounding
+    box, instead of re-measuring every artist in the figure for each line.
+
+    fig: The matplotlib figure to lay out
+    '''
+    def __init__(self, fig):
+        self.fig = fig
+        self.renderer = fig.canvas.get_renderer()
+        # Figure tight bbox (in inches) converted to figure coords
+        count('tight_bbox', fig)
+        bbox = fig.get_tightbbox(self.renderer)
+        self.bbox = bbox.get_points() / fig.get_size_inches()
+
+    def add(self, artist):
+        '''
+        Adds an artist's extent to the layout and returns the artist
+        '''
+        bbox = artist.get_window_extent(self.renderer)
+        
+        # Empty artists are skipped (like in fig.get_tightbbox)
+        if bbox.width != 0 or bbox.height != 0:
+            coords = self.fig.transFigure.inverted().transform(bbox)
+            self.bbox = np.array([np.minimum(self.bbox[0], coords[0]), 
+                                  np.maximum(self.bbox[1], coords[1])])
+        return artist
+
+    def coords(self, loc, obj=None):
+        '''
+        Returns the layout coordinates (see get_coords)
+        '''
+        if obj is None:
+            coords = self.bbox
+        else:
+            bbox = obj.get_tightbbox(self.renderer)
+            coords = self.fig.transFigure.inverted().transform(bbox)
+
+        return {'left': coords[0, 0], 'right': coords[1, 0], 'bottom': coords[0, 1], 'top': coords[1, 1]}[loc]
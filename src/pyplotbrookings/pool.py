@@ -0,0 +1,190 @@
+'''
+A pool of reusable figures for long running jobs.
+
+Figures are taken from the pool for a standard Brookings size, and returned
+(cleared) when they are saved with close=True, so a process rendering many
+charts keeps reusing the same figures and canvases instead of creating new
+ones:
+
+    import pyplotbrookings.pool as ppb_pool
+
+    for state in states:
+        fig = ppb_pool.acquire('medium')
+        ax = fig.add_subplot()
+        ...
+        ppb.save(f'{state}.svg', fig=fig)
+        ppb.save(f'{state}.png', fig=fig, close=True)  # returns fig to the pool
+
+    print(ppb_pool.stats())
+
+Pooled figures are not tracked by pyplot (see plotting.new_figure). A figure
+that isn't saved can be returned with release(fig). A released figure must
+not be used again (it may already be handed to another caller).
+'''
+import os
+import sys
+import threading
+
+import matplotlib as mpl
+
+from . import plotting
+
+
+class FigurePool:
+    '''
+    Cleared figures kept for reuse by size
+
+    max_idle (int): Maximum number of idle figures kept for each size
+    '''
+    def __init__(self, max_idle=4):
+        self.max_idle = max_idle
+        self.idle = {}
+        # Figures handed out and not yet released
+        self.in_use = set()
+        self._lock = threading.Lock()
+
+    def acquire(self, size='medium', dpi=None):
+        '''
+        Returns an empty figure of a Brookings size (small, medium, or large)
+        or size in inches. Keep the figure to one thread until it's released.
+
+        dpi (float): Optional figure DPI (defaults to the theme figure DPI)
+        '''
+        size = tuple(plotting._get_size(size))
+        with self._lock:
+            figures = self.idle.get(size)
+            fig = figures.pop() if figures else None
+
+        if fig is None:
+            fig = plotting.new_figure(size)
+            fig._figure_pool = self
+            fig._pool_size = size
+            # Callbacks matplotlib connects itself (kept on release)
+            fig._pool_callbacks = _callback_ids(fig)
+        else:
+            # Reused figures follow the current theme
+            fig.set_facecolor(mpl.rcParams['figure.facecolor'])
+            fig.set_edgecolor(mpl.rcParams['figure.edgecolor'])
+            fig.set_frameon(mpl.rcParams['figure.frameon'])
+
+        fig.set_dpi(mpl.rcParams['figure.dpi'] if dpi is None else dpi)
+
+        with self._lock:
+            self.in_use.add(fig)
+        return fig
+
+    def release(self, fig):
+        '''
+        Clears a figure and returns it to the pool (figures over the idle
+        limit are dropped). Each acquired figure can only be released once.
+
+        The figure is reset to the state of a new one: its artists, layout 
+        engine, size, background, and the callbacks connected to it are 
+        removed.
+        '''
+        if getattr(fig, '_figure_pool', None) is not self:
+            raise Exception('The figure was not acquired from this pool')
+
+        with self._lock:
+            if fig not in self.in_use:
+                raise Exception('The figure was already released to the pool')
+            self.in_use.discard(fig)
+
+        # Axes are only removed (Figure.clear would clear each one first)
+        for ax in list(fig.axes):
+            fig.delaxes(ax)
+        fig.clear()
+        _reset_figure(fig)
+
+        size = fig._pool_size
+        with self._lock:
+            figures = self.idle.setdefault(size, [])
+            if len(figures) < self.max_idle:
+                figures.append(fig)
+
+    def stats(self):
+        '''
+        Returns a dictionary with the number of figures in use ('live'),
+        idle figures in the pool ('idle'), open pyplot figures ('pyplot'),
+        and the resident memory of the process in bytes ('rss', None if
+        unknown)
+        '''
+        with self._lock:
+            idle = sum(len(figures) for figures in self.idle.values())
+            live = len(self.in_use)
+
+        return {'live': live, 'idle': idle, 'pyplot': len(plotting.plt.get_fignums()),
+                'rss': _resident_memory()}
+
+
+def _callback_ids(fig):
+    '''
+    Returns the ids of the callbacks connected to a figure and its canvas
+    '''
+    # Figure.callbacks (dpi_changed) was removed in matplotlib 3.11
+    registries = [fig.canvas.callbacks, getattr(fig, 'callbacks', None)]
+    return {(registry, cid) for registry in registries if registry is not None
+            for callbacks in registry.callbacks.values() for cid in callbacks}
+
+
+def _reset_figure(fig):
+    '''
+    Resets the state Figure.clear keeps (see FigurePool.release)
+    '''
+    if hasattr(fig, 'set_layout_engine'):
+        # The layout engine set by the theme (as for a new figure)
+        fig.set_layout_engine(None)
+    else:
+        fig.set_tight_layout(None)
+        fig.set_constrained_layout(None)
+
+    fig.set_size_inches(fig._pool_size)
+    fig.patch.set(alpha=None, linewidth=0, hatch=None)
+
+    for registry, cid in _callback_ids(fig) - fig._pool_callbacks:
+        registry.disconnect(cid)
+
+
+def _resident_memory():
+    '''
+    Returns the resident memory of the process in bytes (None if unknown)
+    '''
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # Peak memory (in kilobytes on Linux, bytes on macOS)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+# Pool used by the module functions
+_pool = FigurePool()
+
+
+def acquire(size='medium', dpi=None):
+    '''
+    Returns an empty figure from the shared pool (see FigurePool.acquire)
+    '''
+    return _pool.acquire(size, dpi)
+
+
+def release(fig):
+    '''
+    Returns a figure to its pool (see FigurePool.release)
+    '''
+    fig._figure_pool.release(fig)
+
+
+def stats():
+    '''
+    Returns the shared pool statistics (see FigurePool.stats)
+    '''
+    return _pool.stats()
@@ -0,0 +1,212 @@
+'''
+Timing of the chart pipeline phases (font registration, layout measurement,
+logo decoding, drawing, and saving).
+
+Record the phases of a block of code:
+
+    import pyplotbrookings.profiling as ppb_profiling
+
+    with ppb_profiling.record() as recorder:
+        ppb.set_theme()
+        ...
+        ppb.save('chart.png')
+
+    print(recorder.summary())
+
+Or send every event to a collector function for the whole process:
+
+    ppb_profiling.enable(listener=events.append)
+
+Events are dictionaries with an 'event' type ('phase', 'draw', or 
+'tight_bbox'), a 'name', the id of the 'figure' (or None), and for phases 
+the 'start' time and 'duration' in seconds. Recording is off by default 
+and costs one check per phase when off.
+'''
+import contextlib
+import json
+import threading
+import time
+
+# Active recorders and listeners (events are only created when non-empty)
+_recorders = []
+_listeners = []
+_lock = threading.Lock()
+
+
+def enable(listener):
+    '''
+    Sends all pipeline events to a listener function until disable() is
+    called
+
+    listener (callable): Function called with each event dictionary
+    '''
+    with _lock:
+        _listeners.append(listener)
+
+
+def disable(listener=None):
+    '''
+    Stops sending events to a listener (or to all listeners if None)
+    '''
+    with _lock:
+        if listener is None:
+            _listeners.clear()
+        else:
+            _listeners.remove(listener)
+
+
+@contextlib.contextmanager
+def record():
+    '''
+    Records the pipeline events of a block of code, yields a Recorder
+    '''
+    recorder = Recorder()
+    with _lock:
+        _recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        with _lock:
+            _recorders.remove(recorder)
+
+
+class Recorder:
+    '''
+    Collects pipeline events (see record)
+    '''
+    def __init__(self):
+        self.events = []
+
+    def totals(self, figure=None):
+        '''
+        Returns a dictionary of per phase totals: calls, seconds, draws, and 
+        tight bounding box computations (only counting events that happened 
+        during that phase)
+
+        figure: Optional figure (or figure id) to only total its events
+        '''
+        figure_id = figure if figure is None or isinstance(figure, int) else id(figure)
+        totals = {}
+        for event in self.events:
+            if figure_id is not None and event['figure'] != figure_id:
+                continue
+
+            if event['event'] == 'phase':
+                total = totals.setdefault(event['name'], 
+                                          {'calls': 0, 'seconds': 0.0, 'draws': 0, 'tight_bbox': 0})
+                total['calls'] += 1
+                total['seconds'] += event['duration']
+                total['draws'] += event['draws']
+                total['tight_bbox'] += event['tight_bbox']
+        return totals
+
+    def summary(self, figure=None):
+        '''
+        Returns the phase totals formatted as a text table (slowest first)
+
+        figure: Optional figure (or figure id) to only summarize its events
+        '''
+        rows = sorted(self.totals(figure).items(), key=lambda item: -item[1]['seconds'])
+        lines = [f'{"phase":<24}{"calls":>7}{"total ms":>11}{"mean ms":>10}{"draws":>7}{"bbox":>6}']
+        for name, total in rows:
+            lines.append(f'{name:<24}{total["calls"]:>7}{total["seconds"]*1000:>11.2f}'
+                         f'{total["seconds"]*1000/total["calls"]:>10.2f}'
+                         f'{total["draws"]:>7}{total["tight_bbox"]:>6}')
+        return '\n'.join(lines)
+
+    def to_json(self, path):
+        '''
+        Writes the events to a JSON lines file (one event per line)
+        '''
+        with open(path, 'w') as f:
+            for event in self.events:
+                f.write(json.dumps(event) + '\n')
+
+
+def phase(name, fig=None):
+    '''
+    Returns a context manager timing a pipeline phase (a no-op when nothing
+    is recording)
+
+    name (str): The phase name
+
+    fig: Optional matplotlib figure the phase works on (its draws are counted)
+    '''
+    if not (_recorders or _listeners):
+        return contextlib.nullcontext()
+    return _Phase(name, fig)
+
+
+def count(name, fig=None):
+    '''
+    Records a counted pipeline event (e.g., 'tight_bbox')
+
+    name (str): The event type
+
+    fig: Optional matplotlib figure the event happened on
+    '''
+    if _recorders or _listeners:
+        for active in getattr(_local, 'phases', ()):
+            if name in active.counts:
+                active.counts[name] += 1
+        _emit({'event': name, 'name': name, 'figure': _figure_id(fig)})
+
+
+# Phases running in the current thread (innermost last)
+_local = threading.local()
+
+
+class _Phase:
+    '''
+    Context manager timing a phase and counting the draws and tight bounding
+    box computations that happen during it
+    '''
+    def __init__(self, name, fig):
+        self.name = name
+        self.fig = fig
+        self.counts = {'draw': 0, 'tight_bbox': 0}
+
+    def __enter__(self):
+        if not hasattr(_local, 'phases'):
+            _local.phases = []
+
+        # Draws are counted with the figure's draw events (connected once 
+        # by the outermost phase of a figure)
+        self._draw_cid = None
+        if self.fig is not None and all(active.fig is not self.fig for active in _local.phases):
+            self._draw_cid = self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+        _local.phases.append(self)
+
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter() - self.start
+        _local.phases.remove(self)
+
+        if self._draw_cid is not None:
+            self.fig.canvas.mpl_disconnect(self._draw_cid)
+
+        _emit({'event': 'phase', 'name': self.name, 'figure': _figure_id(self.fig),
+               'start': self.start, 'duration': duration, 
+               'draws': self.counts['draw'], 'tight_bbox': self.counts['tight_bbox']})
+
+    def _on_draw(self, event):
+        count('draw', self.fig)
+
+
+def _figure_id(fig):
+    return None if fig is None else id(fig)
+
+
+def _emit(event):
+    '''
+    Sends an event to the active recorders and listeners
+    '''
+    with _lock:
+        recorders, listeners = list(_recorders), list(_listeners)
+    for recorder in recorders:
+        recorder.events.append(event)
+    for listener in listeners:
+        listener(event)
@@ -0,0 +1,118 @@
+'''
+Thread-safe rendering of Brookings styled charts to bytes, for servers.
+
+Charts are built on their own figures (see plotting.new_figure) instead of
+the pyplot figure manager, so they can be rendered from several threads at
+once. The render() coroutine runs charts on a bounded thread pool without
+blocking an asyncio event loop:
+
+    import pyplotbrookings.render as ppb_render
+
+    def plot_unemployment(ax):
+        ax.plot(...)
+
+    async def handler(request):
+        png = await ppb_render.render(plot_unemployment, title='Unemployment',
+                                      logo='hc')
+        ...
+
+The theme is read from the global matplotlib parameters, so set it once
+(e.g., with set_theme()) before rendering charts from several threads.
+'''
+import asyncio
+import functools
+import io
+import os
+import threading
+
+from . import plotting
+from . import pool
+
+# Thread pool shared by render() calls (created on first use)
+_executor = None
+_max_workers = min(4, os.cpu_count() or 1)
+_executor_lock = threading.Lock()
+
+
+def render_chart(plot, format='png', title=None, subtitle=None, tag=None, notes=(),
+                 logo=None, size='medium', dpi='screen', **kwargs):
+    '''
+    Renders a chart and returns the encoded image as bytes. Safe to call
+    from several threads at once.
+
+    plot (callable): Function drawing the chart, called with the matplotlib
+        axis of the figure
+
+    format (str): Output format (e.g., 'png' or 'svg')
+
+    title, subtitle, tag (str): Chart titles (see add_title)
+
+    notes (list): Notes to place at the bottom of the chart (see add_notes)
+
+    logo (str): Logo path or abbreviation of a supported logo (see add_logo)
+
+    size (str or tuple): Brookings figure size (small, medium, or large) or
+        size in inches
+
+    dpi (str or float): Brookings DPI name (retina, print, screen) or number
+
+    Keyword arguments are passed to the matplotlib savefig() function.
+    '''
+    # Figures are reused from the shared pool (and returned by save with close)
+    fig = pool.acquire(size)
+    try:
+        ax = fig.add_subplot()
+        plot(ax)
+
+        plotting.add_chrome(title=title, subtitle=subtitle, tag=tag, notes=notes,
+                            logo=logo, dpi=dpi, fig=fig)
+    except BaseException:
+        pool.release(fig)
+        raise
+
+    buffer = io.BytesIO()
+    plotting.save(buffer, dpi=dpi, fig=fig, format=format, close=True, **kwargs)
+    return buffer.getvalue()
+
+
+async def render(plot, format='png', **kwargs):
+    '''
+    Renders a chart on the shared thread pool and returns the encoded image
+    as bytes (see render_chart for the arguments). At most max_workers
+    charts are drawn at once, other calls wait for a free thread.
+    '''
+    loop = asyncio.get_running_loop()
+    job = functools.partial(render_chart, plot, format, **kwargs)
+    return await loop.run_in_executor(_get_executor(), job)
+
+
+def set_max_workers(max_workers):
+    '''
+    Sets the number of threads used by render(). Charts already running
+    finish on the previous pool.
+
+    max_workers (int): The maximum number of charts drawn at once
+    '''
+    global _executor, _max_workers
+
+    with _executor_lock:
+        _max_workers = max_workers
+        executor, _executor = _executor, None
+
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def _get_executor():
+    '''
+    Returns the shared thread pool (created on first use)
+    '''
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            _executor = ThreadPoolExecutor(max_workers=_max_workers,
+                                           thread_name_prefix='pyplotbrookings')
+        return _executor
@@ -0,0 +1,274 @@
+'''
+Figure templates for series of charts sharing the same layout.
+
+A template builds the figure, titles, notes, logo, and axes frame once and
+caches them as a rendered background image. Each chart then only draws its
+data on top of the background:
+
+    import pyplotbrookings.templates as ppb_templates
+
+    template = ppb_templates.FigureTemplate(title='Unemployment rate',
+                                            notes=['Source: BLS'], logo='hc',
+                                            xlim=(2000, 2024), ylim=(0, 15))
+
+    for state, rates in unemployment.items():
+        template.render(lambda ax: ax.plot(years, rates), f'{state}.png')
+
+Small multiples use a grid of axes (the plot function is called with the
+array of axes):
+
+    template = ppb_templates.FigureTemplate(nrows=2, ncols=3, sharey=True, ...)
+
+The axes limits are fixed by the template (the axis ticks are part of the
+background). Static artists drawn above the data (by zorder, e.g., the axes 
+spines) are moved from the background to cached foreground layers 
+composited over the data, so charts match a full render.
+'''
+import io
+import os
+
+import matplotlib as mpl
+import numpy as np
+
+from . import plotting
+from .profiling import phase
+
+
+class FigureTemplate:
+    '''
+    A figure with cached titles, notes, logo, and axes frame (see module
+    documentation).
+
+    size (str or tuple): Brookings figure size (small, medium, or large) or
+        size in inches
+
+    title, subtitle, tag (str): Chart titles (see add_title)
+
+    notes (list): Notes to place at the bottom of the figure (see add_notes)
+
+    logo (str): Logo path or abbreviation of a supported logo (see add_logo)
+
+    nrows, ncols (int): Grid of axes for small multiples
+
+    dpi (str or float): Brookings DPI name (retina, print, screen) or number
+        the charts are rendered at
+
+    xlim, ylim (tuple): Limits of every axis
+
+    setup (callable): Optional function called with the axis (or array of
+        axes) to set up the static parts of the chart, e.g., labels, ticks,
+        and limits
+
+    prop_cycle: Optional cycler of the data styles (defaults to the theme 
+        axes.prop_cycle). Every chart starts from its first style.
+
+    Keyword arguments are passed to the matplotlib Figure.subplots() function
+    (e.g., sharex or sharey).
+    '''
+    def __init__(self, size='medium', title=None, subtitle=None, tag=None, notes=(),
+                 logo=None, nrows=1, ncols=1, dpi='screen', xlim=None, ylim=None,
+                 setup=None, prop_cycle=None, **kwargs):
+        self.dpi = plotting._get_dpi(dpi)
+        self.fig = plotting.new_figure(size)
+        self._axes = self.fig.subplots(nrows, ncols, squeeze=False, **kwargs)
+        self.axes = self._axes[0, 0] if self._axes.size == 1 else self._axes
+
+        for ax in self._axes.flat:
+            if xlim is not None:
+                ax.set_xlim(xlim)
+            if ylim is not None:
+                ax.set_ylim(ylim)
+
+        if setup is not None:
+            setup(self.axes)
+
+        # Plotting data no longer changes the limits (or the background)
+        for ax in self._axes.flat:
+            ax.set_autoscale_on(False)
+
+        # Style cycle of the data, restarted for every chart
+        self._prop_cycle = mpl.rcParams['axes.prop_cycle'] if prop_cycle is None else prop_cycle
+        self._reset_cycles()
+
+        plotting.add_chrome(title=title, subtitle=subtitle, tag=tag, notes=notes,
+                            logo=logo, dpi=dpi, fig=self.fig)
+
+        with phase('template_background', self.fig):
+            # The layout is measured and the static parts drawn only once
+            self.bbox = plotting._tight_bbox(self.fig, self.dpi)
+            self.background = np.asarray(plotting._render_rgba(self.fig, self.bbox, self.dpi))
+
+        # Artists making up the background, hidden when drawing the data
+        data_axes = set(self._axes.flat)
+        self._static = [artist for artist in self.fig.get_children() if artist not in data_axes]
+        for ax in self._axes.flat:
+            self._static.extend(ax.get_children())
+        # Artists kept between charts (the data axes are kept but not hidden)
+        self._static_ids = {id(artist) for artist in self._static + list(data_axes)}
+        self._static = [artist for artist in self._static if artist.get_visible()]
+        # Foreground layers and the backgrounds without them (by artist ids)
+        self._foregrounds = {}
+        self._backgrounds = {frozenset(): self.background}
+
+    def render_rgba(self, plot):
+        '''
+        Draws a chart and returns it as an RGBA image array
+
+        plot (callable): Function drawing the data, called with the axis (or
+            the array of axes for small multiples)
+        '''
+        plot(self.axes)
+
+        try:
+            return self._draw_data()
+        finally:
+            self._clear()
+
+    def _draw_data(self):
+        '''
+        Draws the current data artists over the background, returns an RGBA 
+        image array
+        '''
+        layers = self._layers()
+        drawn = [artist for layer in layers for artist in layer]
+
+        # Static artists above the data are left out of the background
+        foreground = frozenset(id(artist) for layer in layers[1::2] for artist in layer)
+        if foreground not in self._backgrounds:
+            below = [artist for artist in self._static if id(artist) not in foreground]
+            with phase('template_background', self.fig):
+                self._backgrounds[foreground] = self._render_only(below, drawn)
+
+        image = self._backgrounds[foreground]
+        for i, layer in enumerate(layers):
+            # Data layers alternate with the static layers drawn above them
+            if i % 2 == 0:
+                with phase('template_data', self.fig):
+                    top = self._render_only(layer, drawn)
+            else:
+                key = frozenset(map(id, layer))
+                if key not in self._foregrounds:
+                    with phase('template_foreground', self.fig):
+                        self._foregrounds[key] = self._render_only(layer, drawn)
+                top = self._foregrounds[key]
+            image = _composite(image, top)
+
+        return image
+
+    def _layers(self):
+        '''
+        Splits the artists in the order matplotlib draws them into data 
+        layers and the static layers between them (static artists below all
+        data are in the background). Returns a list of artist lists 
+        starting with a data layer.
+        '''
+        layers = []
+        for ax in self._axes.flat:
+            # Axes draw their children sorted by zorder (ties in child order)
+            children = [artist for artist in ax.get_children() 
+                        if artist.get_visible() and artist is not ax.patch]
+            children.sort(key=lambda artist: artist.get_zorder())
+
+            level = 0
+            for artist in children:
+                data = id(artist) not in self._static_ids
+                # Odd levels hold data, even levels static artists
+                if data != level % 2:
+                    level += 1
+                if level:
+                    layers.extend([] for _ in range(level - len(layers)))
+                    layers[level - 1].append(artist)
+
+        # Data added to the figure (e.g., a figure legend) is drawn over the axes
+        data = [artist for artist in self.fig.get_children() 
+                if id(artist) not in self._static_ids and artist.get_visible()]
+        if data:
+            if len(layers) % 2 == 0:
+                layers.append([])
+            layers[-1].extend(data)
+
+        return layers
+
+    def _render_only(self, artists, drawn):
+        '''
+        Renders only the given artists (with the other static and drawn 
+        artists hidden), returns an RGBA image array
+        '''
+        artists = set(map(id, artists))
+        hidden = [artist for artist in self._static + drawn if id(artist) not in artists]
+        try:
+            for artist in hidden:
+                artist.set_visible(False)
+            return np.asarray(plotting._render_rgba(self.fig, self.bbox, self.dpi))
+        finally:
+            for artist in hidden:
+                artist.set_visible(True)
+
+    def render(self, plot, filename=None, format=None):
+        '''
+        Draws a chart and saves it (see render_rgba). Returns the path, or the
+        encoded image as bytes if filename is None.
+
+        filename (str): Output path (its extension sets the format)
+
+        format (str): Raster output format (png, jpg, tif, or webp)
+        '''
+        from PIL import Image
+
+        if format is None:
+            format = os.path.splitext(filename)[1].lstrip('.') if filename else 'png'
+        format = format.lower()
+
+        if format not in plotting._raster_formats:
+            raise Exception(f"Templates render raster formats only, one of {list(plotting._raster_formats)}")
+
+        image = Image.fromarray(self.render_rgba(plot), 'RGBA')
+        out = io.BytesIO() if filename is None else filename
+        return plotting._encode_image(image, format, self.dpi, out)
+
+    def _clear(self):
+        '''
+        Removes the data artists added by the last chart (to the axes or the
+        figure, e.g., a figure legend)
+        '''
+        artists = self.fig.get_children()
+        for ax in self._axes.flat:
+            artists.extend(ax.get_children())
+
+        for artist in artists:
+            if id(artist) not in self._static_ids:
+                artist.remove()
+
+        self._reset_cycles()
+
+    def _reset_cycles(self):
+        '''
+        Restarts the style cycle of every axis
+        '''
+        for ax in self._axes.flat:
+            ax.set_prop_cycle(self._prop_cycle)
+
+
+def _composite(background, image):
+    '''
+    Returns an RGBA image drawn over a background (both 8 bit arrays with
+    straight alpha)
+    '''
+    out = background.copy()
+
+    # Data usually covers few pixels, only those are blended
+    covered = np.nonzero(image[..., 3])
+    top, bottom = image[covered], background[covered]
+
+    alpha = top[:, 3:] / np.float32(255)
+    bottom_alpha = bottom[:, 3:] / np.float32(255)
+
+    # Alpha of the result and its color weights
+    out_alpha = alpha + bottom_alpha * (1 - alpha)
+    weight = alpha / out_alpha
+
+    blended = np.empty_like(top)
+    blended[:, :3] = np.rint(top[:, :3] * weight + bottom[:, :3] * (1 - weight))
+    blended[:, 3:] = np.rint(out_alpha * 255)
+    out[covered] = blended
+    return out
@@ -0,0 +1,234 @@
+'''
+Text measurement and wrapping from cached font metrics.
+
+Text widths are computed from tables of glyph advances (and kerning pairs)
+built once per font file and size, so titles and notes can be wrapped to the
+figure width ahead of time without drawing the figure:
+
+    import pyplotbrookings.text as ppb_text
+
+    ppb_text.text_width('Unemployment rate', size=12, weight='bold')
+    ppb_text.wrap_text(long_title, width=400, size=12, weight='bold')
+
+Widths are in points and wrapping only depends on the text, font, size, and
+DPI, so the same string is always broken the same way. Without a DPI text is
+measured unhinted (its width at high resolution); with a DPI it is measured
+with the hinting the Agg renderer uses, which changes widths by a few percent
+(in either direction, depending on the font and DPI). With several DPIs the
+widest measure is used, so wrapped text fits at each of them:
+
+    ppb_text.text_width('Unemployment rate', size=12, weight='bold', dpi=72)
+    ppb_text.wrap_text(long_title, 400, size=12, dpi=(None, 72, 300))
+'''
+import functools
+import threading
+
+import matplotlib as mpl
+from matplotlib import ft2font
+from matplotlib.font_manager import FontProperties, findfont
+
+# FreeType flags (renamed to enums in matplotlib 3.10)
+if hasattr(ft2font, 'LoadFlags'):
+    _NO_HINTING = ft2font.LoadFlags.NO_HINTING
+    _KERNING = ft2font.Kerning.DEFAULT
+else:
+    _NO_HINTING = ft2font.LOAD_NO_HINTING
+    _KERNING = ft2font.KERNING_DEFAULT
+
+
+def text_width(text, size=None, weight='normal', family=None, dpi=None):
+    '''
+    Returns the width of a single line of text in points
+
+    text (str): The text to measure
+
+    size (float): Font size in points (defaults to the theme font size)
+
+    weight (str): Font weight (e.g., 'normal' or 'bold')
+
+    family (str or list): Font family (defaults to the theme font family)
+
+    dpi (float or tuple): Measure the text as drawn (hinted) at this DPI,
+        the widest measure if several DPIs are given (None stands for the
+        unhinted width). If None the text is measured unhinted.
+    '''
+    return get_metrics(size, weight, family, dpi).width(text)
+
+
+def wrap_text(text, width, size=None, weight='normal', family=None, indent=0, dpi=None):
+    '''
+    Returns text with line breaks inserted between words so no line is
+    wider than width. Existing line breaks are kept and words wider than
+    a whole line are left unbroken.
+
+    text (str): The text to wrap
+
+    width (float): Maximum line width in points
+
+    size, weight, family, dpi: The font (see text_width)
+
+    indent (float): Width already taken on the first line in points (e.g.,
+        by a bold prefix)
+    '''
+    metrics = get_metrics(size, weight, family, dpi)
+    return _wrap(text, width, metrics, indent)
+
+
+def get_metrics(size=None, weight='normal', family=None, dpi=None):
+    '''
+    Returns the cached glyph metrics of a font (see _FontMetrics)
+
+    size, weight, family, dpi: The font (see text_width)
+    '''
+    if size is None:
+        size = mpl.rcParams['font.size']
+    if family is None:
+        family = mpl.rcParams['font.family']
+    if not isinstance(family, str):
+        family = tuple(family)
+
+    if isinstance(dpi, (tuple, list)):
+        return _WidestMetrics(tuple(get_metrics(size, weight, family, value) for value in dpi))
+
+    path = _find_font(family, weight)
+    if dpi is None:
+        return _font_metrics(path, float(size))
+    return _font_metrics(path, float(size), float(dpi), _hinting())
+
+
+@functools.lru_cache(maxsize=64)
+def _find_font(family, weight):
+    '''
+    Returns the font file used for a family and weight
+    '''
+    family = family if isinstance(family, str) else list(family)
+    return findfont(FontProperties(family=family, weight=weight))
+
+
+@functools.lru_cache(maxsize=64)
+def _font_metrics(path, size, dpi=None, hinting=None):
+    '''
+    Returns the metrics of a font file at a size (cached per file, size, 
+    DPI, and hinting)
+    '''
+    return _FontMetrics(path, size, dpi, hinting)
+
+
+def _hinting():
+    '''
+    Returns the glyph load flags and hinting factor used by the Agg renderer
+    '''
+    from matplotlib.backends.backend_agg import get_hinting_flag
+
+    # The hinting factor was removed in matplotlib 3.11
+    factor = mpl.rcParams.get('text.hinting_factor') or 1
+    return get_hinting_flag(), factor
+
+
+class _FontMetrics:
+    '''
+    Glyph advance and kerning tables of a font file at a size (in points).
+    The printable Latin-1 characters are measured up front, other characters
+    when first used (the font is locked since tables are shared by threads).
+
+    Without a DPI glyphs are measured unhinted. With a DPI they are measured 
+    at that resolution with the renderer's hinting (flags, factor) and 
+    converted back to points.
+    '''
+    def __init__(self, path, size, dpi=None, hinting=None):
+        self.lock = threading.Lock()
+        self.hinted = dpi is not None
+        if self.hinted:
+            self.flags, self.factor = hinting
+        else:
+            self.flags, self.factor = _NO_HINTING, 1
+            # At 72 DPI font pixels are points
+            dpi = 72
+
+        # Glyphs are hinted horizontally at factor times the resolution
+        self.font = (ft2font.FT2Font(path, hinting_factor=self.factor) if self.factor != 1 
+                     else ft2font.FT2Font(path))
+        self.font.set_size(size, dpi)
+        # Points per 1/64 pixel (the unit of advances and kerning)
+        self.scale = 72 / dpi / 64
+        self.advances = {}
+        self.indexes = {}
+        self.kerning = {}
+
+        for code in range(32, 256):
+            self._load(chr(code))
+
+    def _load(self, char):
+        '''
+        Adds a character to the advance table
+        '''
+        with self.lock:
+            # Missing characters are drawn (and measured) as the empty glyph 0
+            index = self.font.get_char_index(ord(char))
+            glyph = self.font.load_glyph(index, flags=self.flags)
+            self.indexes[char] = index
+            if self.hinted:
+                # Hinted advances are rounded to whole pixels
+                self.advances[char] = glyph.horiAdvance / self.factor * self.scale
+            else:
+                self.advances[char] = glyph.linearHoriAdvance / 65536
+
+    def width(self, text):
+        '''
+        Returns the width of a single line of text in points
+        '''
+        width = 0.0
+        previous = None
+        for char in text:
+            if char not in self.advances:
+                self._load(char)
+            width += self.advances[char]
+
+            if previous is not None:
+                pair = (previous, char)
+                if pair not in self.kerning:
+                    with self.lock:
+                        self.kerning[pair] = self.font.get_kerning(
+                            self.indexes[previous], self.indexes[char], _KERNING) * self.scale
+                width += self.kerning[pair]
+            previous = char
+
+        return width
+
+
+class _WidestMetrics:
+    '''
+    The widest measure of several font metrics (e.g., at several DPIs)
+    '''
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def width(self, text):
+        return max(metrics.width(text) for metrics in self.metrics)
+
+
+def _wrap(text, width, metrics, indent=0):
+    '''
+    Greedily breaks text into lines no wider than width (see wrap_text)
+    '''
+    space = metrics.width(' ')
+    lines = []
+
+    for paragraph in text.split('\n'):
+        line, line_width = [], indent
+        for word in paragraph.split(' '):
+            word_width = metrics.width(word)
+            gap = space if line else 0
+
+            # Start a new line if the word doesn't fit on this one
+            if (line or line_width) and line_width + gap + word_width > width:
+                lines.append(' '.join(line))
+                line, line_width, gap = [], 0, 0
+
+            line_width += gap + word_width
+            line.append(word)
+
+        lines.append(' '.join(line))
+        indent = 0
+
+    return '\n'.join(lines)
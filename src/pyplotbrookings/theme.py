@@ -0,0 +1,431 @@
+'''
+The Brookings matplotlib theme: bundled fonts, palette colormaps, and 
+default style parameters.
+'''
+from cycler import cycler
+import matplotlib as mpl
+import matplotlib.colors
+from matplotlib import font_manager
+import functools
+import json
+import os
+import re
+import threading
+
+from .palettes import _palettes, _palette_listeners, get_palette
+from .profiling import phase
+
+# Parameters that are not part of a style (e.g., backend) and are left alone
+# by rcdefaults and themes (moved to matplotlib.style in matplotlib 3.11)
+try:
+    from matplotlib.style import _STYLE_BLACKLIST as _style_blacklist
+except ImportError:
+    from matplotlib.style.core import STYLE_BLACKLIST as _style_blacklist
+
+# Cache of colormaps built from the palettes (see get_cmap)
+_cmaps = {}
+
+# Theme most recently applied (see Theme.apply)
+_current_theme = None
+# Lock held while themes change matplotlib's rcParams
+_rc_lock = threading.RLock()
+
+# Directory of the fonts that ship with the package
+_font_dir = os.path.join(os.path.dirname(__file__), 'fonts')
+# Index of bundled font families to font files (loaded once per process)
+_font_index = None
+# Font families already added to matplotlib's font manager
+_registered_fonts = set()
+
+
+def _package_version():
+    '''
+    Returns the installed version of pyplotbrookings (or None if the
+    package metadata is unavailable)
+    '''
+    try:
+        from importlib.metadata import version
+        return version('pyplotbrookings')
+    except Exception:
+        return None
+
+
+def _load_font_index():
+    '''
+    Returns a dictionary mapping bundled font family names to their font
+    files. The index is cached on disk (in the matplotlib cache directory)
+    and keyed by the package version and font file modification times, so 
+    font files are only parsed when the bundled fonts change.
+    '''
+    global _font_index
+
+    if _font_index is not None:
+        return _font_index
+
+    # Listing font files is cheap, parsing them is not
+    font_files = font_manager.findSystemFonts(fontpaths=_font_dir, fontext='ttf')
+    key = {'version': _package_version(),
+           'files': {os.path.relpath(f, _font_dir): os.path.getmtime(f) 
+                     for f in sorted(font_files)}}
+    index_path = os.path.join(mpl.get_cachedir(), 'pyplotbrookings-fonts.json')
+
+    # Try reading a still valid index from disk
+    try:
+        with open(index_path) as f:
+            cached = json.load(f)
+        if cached['key'] == key:
+            _font_index = cached['families']
+            return _font_index
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    # Otherwise parse every font file for its family name
+    families = {}
+    for font_file in key['files']:
+        font = font_manager.get_font(os.path.join(_font_dir, font_file))
+        family = font_manager.ttfFontProperty(font).name
+        families.setdefault(family, []).append(font_file)
+
+    # Caching the index is best effort (the cache dir may be read only)
+    try:
+        with open(index_path, 'w') as f:
+            json.dump({'key': key, 'families': families}, f)
+    except OSError:
+        pass
+
+    _font_index = families
+    return _font_index
+
+
+def _register_font_family(font_family):
+    '''
+    Adds the bundled fonts of a font family (e.g., 'Inter') to the 
+    matplotlib font manager. Families are only registered once per process
+    and names that are not bundled with the package are ignored.
+
+    font_family (str): The font family name
+    '''
+    family = str(font_family).lower()
+
+    if family in _registered_fonts:
+        return
+
+    with phase('register_fonts'):
+        for name, font_files in _load_font_index().items():
+            if name.lower() == family:
+                for font_file in font_files:
+                    font_manager.fontManager.addfont(os.path.join(_font_dir, font_file))
+
+    _registered_fonts.add(family)
+
+
+def set_theme(font_size=12, line_width=1.4, font_family='Inter', 
+              background_color='transparent'):
+    '''
+    Sets matplotlib default style parameters to be consistent with
+    the Brookings style. 
+
+    font_size (float): A number specifying the base font size of all 
+        default plots
+
+    line_width (float): A number specifying the default thickness of all
+        lines in plots
+        
+    font_family (str): The font family for figures (either Helvetica or Roboto)
+
+    background_color (str): The background color of the plot, specified as
+        a named color string (e.g., 'white') or hexcode (e.g., '#FFFFFF').
+        Defaults to a transparent plot background.
+    '''
+    with phase('set_theme'):
+        try:
+            # Compiled themes are cached so repeated calls only copy parameters
+            theme = _get_theme(font_size, line_width, font_family, background_color)
+        except TypeError:
+            # Unhashable arguments (e.g., a list of RGB values) aren't cached
+            theme = Theme(font_size, line_width, font_family, background_color)
+
+        theme.apply()
+
+
+@functools.lru_cache(maxsize=16)
+def _get_theme(font_size, line_width, font_family, background_color):
+    '''
+    Returns a cached compiled Theme (see set_theme)
+    '''
+    return Theme(font_size, line_width, font_family, background_color)
+
+
+class Theme:
+    '''
+    A compiled Brookings theme. The style parameters are validated once
+    when the theme is created, after which applying the theme only copies
+    them into matplotlib's rcParams. Themes can be applied globally, for 
+    the duration of a with block, or exported as a matplotlib style file:
+
+        white = ppb.Theme(background_color='white')
+
+        with white:
+            fig = ppb.figure('medium')
+            plt.plot(x, y)
+            ppb.save('chart.png')
+
+        white.export('brookings-white.mplstyle')
+
+    The with block restores the previous parameters on exit. matplotlib's 
+    parameters are global, so the theme applies to the whole process (every
+    thread and asyncio task) while the block is active, and overlapping 
+    blocks must exit in the reverse order they were entered. Parameters are
+    only swapped under a lock, so concurrent set_theme() calls never mix 
+    two themes. To render different themes at once, use processes (see 
+    batch.render_batch).
+
+    font_size, line_width, font_family, background_color: See set_theme
+    '''
+    def __init__(self, font_size=12, line_width=1.4, font_family='Inter', 
+                 background_color='transparent'):
+        self.font_size = font_size
+        self.line_width = line_width
+        self.font_family = font_family
+        self.background_color = background_color
+
+        # Should the background plot be transparent
+        transparent = (background_color == 'transparent')
+        background_color = 'white' if transparent else background_color
+
+        # Registering the bundled font family (only scanned once per process)
+        _register_font_family(font_family)
+
+        # Dictionary of style features to set
+        self.style = {
+            'axes.axisbelow': True,  # Place gride lines behind the plot
+            'axes.facecolor': background_color,
+            'figure.facecolor': background_color,
+
+            'axes.grid': True,
+            'axes.grid.axis': 'y',
+            'axes.labelsize': 0.833*font_size,
+            'axes.labelweight': 'bold',
+            'axes.linewidth': line_width,
+            'axes.spines.left': False,
+            'axes.spines.right': False,
+            'axes.spines.top': False,
+            
+            # Setting label color to Gray 90
+            'text.color': '#191919',
+            'axes.labelcolor': '#191919',
+            'xtick.color': '#191919',
+            'ytick.color': '#191919',
+            
+            # Set default palettes
+            'axes.prop_cycle': mpl.cycler(color=get_palette('6-color')),
+            'image.cmap': _cmap_name('sequential (two hues)'),
+
+            'figure.figsize': (6, 4),
+            'font.size': font_size,
+            'font.family': font_family, 
+
+            'grid.color': '#CCCCCC',
+            'grid.linestyle': (0, (1, 4)),
+
+            'legend.loc': 'upper center',
+            'legend.frameon': False,  # Remove legend border
+            'legend.handlelength': 0.75,  # Shorten size of legend key
+            'legend.borderaxespad': -1,  # Place legend outside the figure
+            'legend.fontsize': 0.833*font_size,
+
+            'patch.linewidth': 0,
+
+            'ytick.left': False,
+            'ytick.labelsize': 0.833*font_size,
+            'xtick.labelsize': 0.833*font_size,
+            
+            'savefig.transparent': transparent,
+        }
+
+        # Matplotlib defaults (as set by rcdefaults) overridden by the 
+        # validated style, read once and restored
+        with _rc_lock:
+            saved = dict(dict.items(mpl.rcParams))
+            mpl.rcdefaults()
+            self.rc = _style_params(mpl.rcParams)
+            dict.update(mpl.rcParams, saved)
+        self.rc.update(dict.items(mpl.RcParams(self.style)))
+
+        # Parameters replaced by each active with block
+        self._saved = []
+
+    def __repr__(self):
+        return (f'Theme(font_size={self.font_size!r}, line_width={self.line_width!r}, '
+                f'font_family={self.font_family!r}, background_color={self.background_color!r})')
+
+    def apply(self):
+        '''
+        Sets the matplotlib default style parameters to the theme
+        '''
+        global _current_theme
+
+        # Parameters are already validated, skip validating them again
+        with _rc_lock:
+            dict.update(mpl.rcParams, self.rc)
+            _current_theme = self
+
+    def __enter__(self):
+        global _current_theme
+
+        with _rc_lock:
+            self._saved.append((_style_params(mpl.rcParams), _current_theme))
+            self.apply()
+        return self
+
+    def __exit__(self, *exc_info):
+        global _current_theme
+
+        with _rc_lock:
+            rc, _current_theme = self._saved.pop()
+            dict.update(mpl.rcParams, rc)
+
+    def export(self, path):
+        '''
+        Writes the theme as a matplotlib style file (.mplstyle) that can be 
+        used with plt.style.use(path), also without pyplotbrookings. The 
+        Brookings colormap is only registered by pyplotbrookings, so the 
+        file uses the closest stock colormap (the Brookings one is left in a
+        comment).
+
+        path (str): The style file path
+        '''
+        lines = [f'# Brookings theme: {self!r}',
+                 f'# The {self.font_family} fonts ship with pyplotbrookings (matplotlib uses '
+                 'its default font if they are not installed)']
+        for key in self.style:
+            value = _rc_to_str(self.rc[key])
+            if key == 'image.cmap' and value.startswith('brookings.'):
+                lines.append(f'# {key}: {value} (after importing pyplotbrookings)')
+                value = _stock_cmaps.get(value, 'viridis')
+            lines.append(f'{key}: {value}')
+
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+
+def _style_params(rc):
+    '''
+    Returns the style parameters of rcParams as a dictionary (without the
+    blacklisted parameters, e.g., backend)
+    '''
+    return {key: value for key, value in dict.items(rc) if key not in _style_blacklist}
+
+
+def _rc_to_str(value):
+    '''
+    Formats a validated rcParams value for a matplotlib style file
+    '''
+    if isinstance(value, (list, tuple)) and not isinstance(value[-1], (list, tuple)):
+        value = ', '.join(map(str, value))
+    elif not isinstance(value, str):
+        value = repr(value)
+    
+    # '#' starts a comment in style files (hex colors are written without it)
+    return re.sub(r'#([0-9A-Fa-f]{3,8})\b', r'\1', value)
+
+
+def get_cmap(name, reverse=False, **kargs):
+    '''
+    Given a palette name returns a Brookings theme colormap. 
+    Note not all palettes (e.g., brand 1) should be used as colormaps.
+
+    Colormaps are built once and cached (including reversed and resampled 
+    variants), so repeated calls only copy the precomputed lookup table. 
+    All palettes are also registered with matplotlib as 'brookings.<name>'
+    (and 'brookings.<name>_r' reversed), e.g., cmap='brookings.teal'.
+
+    name (str): Name of the color map from either the color palette or 
+        extended color palette.
+
+    reverse (bool): If the color map should be reversed
+
+    **kargs: Keyword arguments for LinearSegmentedColormap.from_list 
+        (e.g., N the number of colors in the lookup table)
+    '''
+    key = (name, reverse) + tuple(sorted(kargs.items()))
+
+    if key not in _cmaps:
+        colors = get_palette(name)
+
+        # Reverse colors if needed
+        if reverse:
+            colors = colors[::-1]
+
+        # Single color palettes map every value to that color
+        if len(colors) == 1:
+            colors = list(colors) * 2
+
+        # Build a color map over the list of colors
+        cmap = mpl.colors.LinearSegmentedColormap.from_list(
+            _cmap_name(name, reverse), colors, **kargs)
+        # Calling the colormap computes its lookup table (shared by copies)
+        cmap(0)
+        _cmaps[key] = cmap
+
+    # Return a copy so changes (e.g., set_bad) don't leak into the cache
+    return _cmaps[key].copy()
+
+
+# Stock matplotlib colormaps closest to the Brookings colormaps (see export)
+_stock_cmaps = {'brookings.sequential (two hues)': 'viridis', 
+                'brookings.sequential (single hue)': 'Blues_r',
+                'brookings.diverging': 'RdBu'}
+
+
+def _cmap_name(name, reverse=False):
+    '''
+    Returns the registered matplotlib colormap name of a palette
+    '''
+    return 'brookings.' + name + ('_r' if reverse else '')
+
+
+def _register_cmap(name):
+    '''
+    Registers a palette's colormap (and its reverse) with matplotlib,
+    replacing any colormaps built from an older palette with that name
+    '''
+    for key in [key for key in _cmaps if key[0] == name]:
+        del _cmaps[key]
+
+    for reverse in (False, True):
+        mpl.colormaps.register(get_cmap(name, reverse), 
+                               name=_cmap_name(name, reverse), force=True)
+
+def set_palette(name, ax=None, reverse=False):
+    '''
+    Sets the a color palette cycler for the current axis
+
+    name (str): Name of the Brookings color palette
+
+    ax: Optional matplotlib axis object to specify which axis to apply 
+        the color palette to
+
+    reverse (bool): If the color palette should be reversed
+    '''
+    palette = get_palette(name)
+    # Reverse the palette if specified
+    if reverse:
+            palette = palette[::-1]
+
+    # Get current axis if not specified
+    if not ax:
+        import matplotlib.pyplot as plt
+        ax = plt.gca()
+
+    # Create a cycler for the selected color palette
+    palette_cycler = cycler(color=palette)
+    # Set the cycler as base for the current/given axis
+    ax.set_prop_cycle(palette_cycler)
+
+
+# Register all palettes as named matplotlib colormaps (and any palettes 
+# added later by make_palette)
+for _name in _palettes:
+    _register_cmap(_name)
+_palette_listeners.append(_register_cmap)
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import matplotlib
+matplotlib.use('Agg')
+
+import pytest
+
+# Tests run against the source tree
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+@pytest.fixture(autouse=True)
+def restore_rcparams():
+    '''
+    Restores the matplotlib parameters and closes pyplot figures after each
+    test
+    '''
+    import matplotlib.pyplot as plt
+
+    with matplotlib.rc_context():
+        yield
+    plt.close('all')
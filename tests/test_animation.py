@@ -0,0 +1,41 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import pyplotbrookings.animation as ppb_animation
+import pyplotbrookings.templates as ppb_templates
+
+
+@pytest.fixture
+def template():
+    return ppb_templates.FigureTemplate(size='small', title='Rates', xlim=(0, 10), ylim=(0, 10))
+
+
+def update(ax, frame):
+    ax.plot([0, frame], [0, frame])
+
+
+def test_gif_frames(template):
+    data = ppb_animation.animate(template, update, range(4), fps=5)
+    gif = Image.open(io.BytesIO(data))
+    assert gif.n_frames == 4
+    assert gif.info['duration'] == 200
+
+
+def test_png_sequence_in_worker_processes(template, tmp_path):
+    paths = ppb_animation.animate(template, update, range(3), str(tmp_path / '{:02d}.png'),
+                                  processes=1)
+    assert [path[-6:] for path in paths] == ['00.png', '01.png', '02.png']
+    assert np.asarray(Image.open(paths[2])).shape[2] == 4
+
+
+def test_errors_cancel_pending_frames(template, tmp_path):
+    def failing(ax, frame):
+        if frame == 3:
+            raise ValueError('frame')
+        update(ax, frame)
+
+    with pytest.raises(ValueError):
+        ppb_animation.animate(template, failing, range(10), str(tmp_path / 'a.gif'), processes=1)
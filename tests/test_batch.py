@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+import pyplotbrookings.batch as ppb_batch
+
+
+def plot_line(ax):
+    ax.plot([1, 3, 2])
+
+
+def plot_error(ax):
+    raise ValueError('bad data')
+
+
+def plot_slow(ax):
+    time.sleep(30)
+
+
+def run(specs, **kwargs):
+    results = list(ppb_batch.render_batch(specs, processes=2, **kwargs))
+    assert sorted(result.index for result in results) == list(range(len(specs)))
+    return {result.index: result for result in results}
+
+
+def test_render_batch_outputs(tmp_path):
+    path = str(tmp_path / 'chart.png')
+    results = run([ppb_batch.ChartSpec(plot_line, title='Title', notes=('Source: x',)),
+                   ppb_batch.ChartSpec(plot_line, path),
+                   ppb_batch.ChartSpec(plot_line, format='svg')])
+
+    assert results[0].error is None and results[0].data.startswith(b'\x89PNG')
+    assert results[1].error is None and results[1].filename == path and results[1].data is None
+    with open(path, 'rb') as file:
+        assert file.read(4) == b'\x89PNG'
+    assert b'<svg' in results[2].data
+    assert all(result.elapsed > 0 for result in results.values())
+
+
+def test_render_batch_errors_are_per_chart():
+    results = run([ppb_batch.ChartSpec(plot_error, 'error.png'),
+                   # Lambdas can't be sent to the workers
+                   ppb_batch.ChartSpec(lambda ax: ax.plot([1, 2])),
+                   ppb_batch.ChartSpec(plot_line)])
+
+    assert 'ValueError: bad data' in results[0].error
+    assert results[0].filename == 'error.png'
+    assert 'pickle' in results[1].error.lower()
+    assert results[2].error is None
+
+
+def test_render_batch_timeout():
+    start = time.perf_counter()
+    results = run([ppb_batch.ChartSpec(plot_slow),
+                   ppb_batch.ChartSpec(plot_slow, timeout=0.5),
+                   ppb_batch.ChartSpec(plot_line)], timeout=1)
+
+    assert time.perf_counter() - start < 20
+    assert results[0].error == 'Chart rendering timed out after 1 seconds'
+    assert results[1].error == 'Chart rendering timed out after 0.5 seconds'
+    assert results[2].error is None
@@ -0,0 +1,113 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+import pyplotbrookings.cache as ppb_cache
+
+
+class Point:
+    def __init__(self, value):
+        self.value = value
+
+
+class Labeled:
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return f'Labeled({self.value!r})'
+
+
+def make_plot(color):
+    def plot(ax, values):
+        ax.plot(values, color=color)
+    return plot
+
+
+def write(path, size):
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ppb_cache.ChartCache(tmp_path / 'cache', max_bytes=1000)
+
+
+def test_key_is_stable(cache):
+    data = (np.arange(5), 'rates')
+    assert cache.key(make_plot('red'), data, title='A') == cache.key(make_plot('red'), data, title='A')
+
+
+def test_distinct_closures_give_distinct_keys(cache):
+    assert cache.key(make_plot('red'), (1,)) != cache.key(make_plot('blue'), (1,))
+
+
+def test_distinct_lambdas_give_distinct_keys(cache):
+    first = lambda ax: ax.plot([1, 2])
+    second = lambda ax: ax.plot([2, 1])
+    assert cache.key(first) != cache.key(second)
+
+
+def test_distinct_objects_give_distinct_keys(cache):
+    assert cache.key(None, (Labeled(1),)) != cache.key(None, (Labeled(2),))
+
+
+def test_objects_without_stable_hash_raise(cache):
+    with pytest.raises(TypeError):
+        cache.key(None, (Point(1),))
+
+
+def test_recursive_closure(cache):
+    def outer(n):
+        def plot(ax):
+            return plot if n else None
+        return plot
+
+    assert cache.key(outer(1)) != cache.key(outer(0))
+
+
+def test_key_depends_on_theme(cache):
+    import matplotlib as mpl
+
+    key = cache.key(None, (1,))
+    mpl.rcParams['lines.linewidth'] = 7
+    assert cache.key(None, (1,)) != key
+
+
+def test_eviction_keeps_the_cache_under_max_bytes(cache, tmp_path):
+    for i in range(12):
+        source = write(tmp_path / f'{i}.png', 200)
+        cache.put(f'{i:040x}', 'png', source)
+
+    assert cache.size() <= cache.max_bytes
+    # The most recent chart is kept
+    assert cache.get(f'{11:040x}', 'png') is not None
+
+
+def test_eviction_keeps_fresh_temporary_files(cache, tmp_path):
+    folder = os.path.join(cache.directory, 'ab')
+    os.makedirs(folder)
+    fresh = write(os.path.join(folder, 'ab.png.123.tmp'), 600)
+    stale = write(os.path.join(folder, 'cd.png.456.tmp'), 600)
+    old = time.time() - 2 * cache.temp_grace
+    os.utime(stale, (old, old))
+
+    cache.put('ef' * 20, 'png', write(tmp_path / 'chart.png', 200))
+
+    assert os.path.exists(fresh)
+    assert not os.path.exists(stale)
+
+
+def test_render_uses_the_build_function(tmp_path):
+    cache = ppb_cache.ChartCache(tmp_path / 'cache')
+    first = cache.render(str(tmp_path / 'a.png'), make_plot('red'), data=([1, 2],))
+    second = cache.render(str(tmp_path / 'b.png'), make_plot('blue'), data=([1, 2],))
+    third = cache.render(str(tmp_path / 'c.png'), make_plot('red'), data=([1, 2],))
+
+    assert (first, second, third) == (False, False, True)
+    with open(tmp_path / 'a.png', 'rb') as a, open(tmp_path / 'b.png', 'rb') as b:
+        assert a.read() != b.read()
@@ -0,0 +1,91 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import pyplotbrookings.classify as ppb_classify
+
+
+def sum_squares(values, classes, k):
+    return sum(((values[classes == c] - values[classes == c].mean()) ** 2).sum()
+               for c in range(k) if (classes == c).any())
+
+
+def brute_force(values, k):
+    '''
+    Smallest sum of squares of splitting the sorted values into k classes
+    (values that are equal stay in the same class)
+    '''
+    unique = np.unique(values)
+    best = np.inf
+    for cuts in itertools.combinations(range(1, len(unique)), k - 1):
+        classes = np.searchsorted(unique[list(cuts)], values, side='right')
+        best = min(best, sum_squares(values, classes, k))
+    return best
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_natural_breaks_optimal(seed):
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 12, rng.integers(6, 13)).astype(float) * rng.choice([1, 0.1, 1000])
+    k = int(rng.integers(2, 5))
+    if len(np.unique(values)) <= k:
+        pytest.skip('fewer values than classes')
+
+    result = ppb_classify.classify(values, 'natural_breaks', k=k)
+    assert result.k == k
+    assert sum_squares(values, result.classes, k) == pytest.approx(brute_force(values, k), rel=1e-9, abs=1e-9)
+
+
+def test_natural_breaks_separates_clusters():
+    values = np.concatenate([np.full(50, 1.0), np.full(30, 10.0), np.full(20, 100.0)])
+    result = ppb_classify.classify(values, 'natural_breaks', k=3)
+    assert result.bins.tolist() == [1, 1, 10, 100]
+    assert result.counts.tolist() == [50, 30, 20]
+
+
+def test_natural_breaks_few_values():
+    result = ppb_classify.classify([1, 2, 2, 1], 'natural_breaks', k=5)
+    assert result.k == 2
+    assert result.classes.tolist() == [0, 1, 1, 0]
+
+
+def test_natural_breaks_sample():
+    values = np.random.default_rng(0).normal(size=5000)
+    sampled = ppb_classify.classify(values, 'natural_breaks', k=4, sample=1000)
+    assert sampled.bins[0] == values.min() and sampled.bins[-1] == values.max()
+    assert np.array_equal(sampled.bins, ppb_classify.classify(values, 'natural_breaks', k=4, sample=1000).bins)
+
+
+def test_quantile_and_missing_values():
+    values = np.array([[1, 2, 3, 4], [5, 6, np.nan, 8]])
+    result = ppb_classify.classify(values, 'quantile', k=2)
+
+    assert result.classes.shape == values.shape
+    assert result.classes[1, 2] == -1
+    assert result.counts.tolist() == [4, 3]
+    rgba = result.to_rgba()
+    assert rgba.shape == (2, 4, 4)
+    assert np.all(rgba[1, 2] == 0)
+    assert np.array_equal(rgba[0, 0], result.colors[0])
+
+
+def test_fixed_breaks_and_labels():
+    result = ppb_classify.classify([0, 1, 2, 3], 'fixed', bins=[1, 2], label_format='{:.0f}')
+
+    # Values equal to a break belong to the lower class
+    assert result.classes.tolist() == [0, 0, 1, 2]
+    assert result.labels == ['0 – 1', '1 – 2', '2 – 3']
+    assert len(result.legend_handles()) == 3
+
+
+def test_equal_interval():
+    result = ppb_classify.classify(np.arange(11), 'equal_interval', k=5)
+    assert np.allclose(result.bins, [0, 2, 4, 6, 8, 10])
+
+
+@pytest.mark.parametrize('kwargs', [dict(values=[np.nan]), dict(values=[1, 2], scheme='fixed'),
+                                    dict(values=[1, 2], scheme='jenks')])
+def test_classify_errors(kwargs):
+    with pytest.raises(Exception):
+        ppb_classify.classify(**kwargs)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from matplotlib.colors import to_rgba
+
+import pyplotbrookings.pyplotbrookings as ppb
+
+
+def test_to_rgba_array_keeps_shape():
+    hexcodes = np.array([['#FF0000', '#00FF00', '#0000FF'], ['#000000', '#FFFFFF', '#FF0000']])
+    named = np.array([['red', 'blue'], ['#abc', 'red']])
+
+    rgba = ppb.to_rgba_array(hexcodes)
+    assert rgba.shape == (2, 3, 4)
+    assert np.allclose(rgba[1, 1], to_rgba('#FFFFFF'))
+
+    rgba = ppb.to_rgba_array(named)
+    assert rgba.shape == (2, 2, 4)
+    assert np.allclose(rgba[1, 0], to_rgba('#abc'))
+    assert ppb.to_rgba_array('red').shape == (1, 4)
+
+
+def test_map_color_names_keeps_shape():
+    names = np.array([['yellow 50', 'vivid blue 50'], ['vivid blue 50', 'yellow 50']])
+    rgba = ppb.map_color_names(names)
+
+    assert rgba.shape == (2, 2, 4)
+    assert np.array_equal(rgba[0, 0], rgba[1, 1])
+    assert np.allclose(rgba[0, 1], to_rgba(ppb.get_color('vivid blue 50')))
+
+
+def test_get_text_colors_keeps_shape():
+    backgrounds = np.array([['#000000', '#FFFFFF']])
+    assert ppb.get_text_colors(backgrounds).tolist() == [['#FFFFFF', '#000000']]
+    assert ppb.get_text_colors(backgrounds, as_hex=False).shape == (1, 2, 4)
+
+
+def test_map_values_clips_infinite_values():
+    values = np.array([-np.inf, 0, 0.5, 1, np.inf, np.nan])
+    rgba = ppb.map_values(values, 'sequential (single hue)', vmin=0, vmax=1)
+    lut = ppb.map_values(np.array([0, 1]), 'sequential (single hue)')
+
+    assert np.array_equal(rgba[0], lut[0])
+    assert np.array_equal(rgba[4], lut[1])
+    assert np.all(rgba[5] == 0)
+
+
+@pytest.mark.parametrize('vmin, vmax', [(None, None), (2, 2)])
+def test_map_values_degenerate_range(vmin, vmax):
+    values = np.array([-np.inf, 2, 2, np.inf, np.nan])
+    rgba = ppb.map_values(values, 'sequential (single hue)', vmin=vmin, vmax=vmax)
+    lut = ppb.map_values(np.array([0, 1]), 'sequential (single hue)')
+
+    assert np.array_equal(rgba[0], lut[0])
+    assert np.array_equal(rgba[1], lut[0])
+    assert np.array_equal(rgba[3], lut[1])
+    assert np.all(rgba[4] == 0)
+
+
+def test_map_values_keeps_shape():
+    values = np.arange(6.0).reshape(2, 3)
+    assert ppb.map_values(values, 'sequential (single hue)').shape == (2, 3, 4)
@@ -0,0 +1,52 @@
+import matplotlib.pyplot as plt
+import numpy as np
+
+import pyplotbrookings.lines as ppb_lines
+
+
+def test_minmax_index_keeps_extremes():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, 100, 20000))
+    y = rng.normal(size=x.size)
+    y[rng.integers(0, x.size, 500)] = np.nan
+
+    index = ppb_lines._minmax_index(x, y, 0, 100, 50)
+    assert np.all(np.diff(index) > 0)
+    assert len(index) <= 4 * 50
+
+    # Every bucket keeps its first, last, minimum, and maximum point
+    bucket = np.minimum((x / 2).astype(int), 49)
+    for b in range(50):
+        points = np.flatnonzero(bucket == b)
+        kept = set(index[bucket[index] == b])
+        assert {points[0], points[-1]} <= kept
+        assert points[np.nanargmin(y[points])] in kept
+        assert points[np.nanargmax(y[points])] in kept
+
+
+def test_line_draws_downsampled_view():
+    fig, ax = plt.subplots(figsize=(4, 3), dpi=100)
+    x = np.arange(100000.0)
+    y = np.sin(x / 1000)
+    line, = ppb_lines.line(x, y, ax=ax, label='sine')
+    fig.canvas.draw()
+
+    drawn_x, drawn_y = line.get_data()
+    assert len(drawn_x) <= 4 * ax.bbox.width + 2
+    assert np.nanmax(drawn_y) == y.max() and np.nanmin(drawn_y) == y.min()
+
+    # Zooming in shows the full detail
+    ax.set_xlim(1000, 1100)
+    fig.canvas.draw()
+    assert np.array_equal(line.get_data()[0], x[999:1102])
+
+
+def test_label_lines():
+    fig, ax = plt.subplots()
+    x = np.arange(10)
+    for offset, label in ((0, 'low'), (5, 'high'), (5.1, '')):
+        ax.plot(x, x + offset, label=label)
+
+    labels = ppb_lines.label_lines(ax=ax)
+    assert [label.get_text() for label in labels] == ['low', 'high']
+    assert [label.get_color() for label in labels] == [line.get_color() for line in ax.get_lines()[:2]]
@@ -0,0 +1,72 @@
+import datetime
+
+import matplotlib.dates as mdates
+import numpy as np
+import pytest
+
+import pyplotbrookings.live as ppb_live
+
+
+def test_ring_buffer_keeps_last_values():
+    buffer = ppb_live._RingBuffer(5)
+    expected = []
+    for chunk in ([1, 2], [3], [4, 5, 6, 7], [8, 9, 10, 11, 12, 13], []):
+        buffer.extend(np.array(chunk, dtype=float))
+        expected = (expected + chunk)[-5:]
+        assert buffer.view().tolist() == expected
+        assert len(buffer) == len(expected)
+        # Views share the storage
+        assert buffer.view().base is buffer.storage
+
+
+def test_ring_buffer_keeps_dates():
+    buffer = ppb_live._RingBuffer(3)
+    days = np.arange('2024-01-01', '2024-01-05', dtype='datetime64[D]')
+    buffer.extend(days)
+    assert buffer.view().dtype == days.dtype
+    assert buffer.view().tolist() == days[-3:].tolist()
+
+    buffer.extend(np.array([datetime.datetime(2024, 1, 9)], dtype=object))
+    assert buffer.view()[-1] == np.datetime64('2024-01-09')
+
+
+def test_ring_buffer_rejects_other_values():
+    with pytest.raises(TypeError):
+        ppb_live._RingBuffer(3).extend(np.array(['a', 'b']))
+
+    buffer = ppb_live._RingBuffer(3)
+    buffer.extend(np.array([1.0, 2.0]))
+    with pytest.raises(TypeError):
+        buffer.extend(np.array(['2024-01-01'], dtype='datetime64[D]'))
+
+
+def test_live_chart_blit_matches_full_draw():
+    chart = ppb_live.LiveChart(2, capacity=50, title='Requests per second')
+    for i in range(120):
+        chart.append(i, np.sin(i / 10), series=0)
+        chart.append(i, np.cos(i / 10), series=1)
+        chart.update()
+
+    assert chart.redraws < 120 / 2
+    assert chart.data(0)[0].tolist() == list(range(70, 120))
+
+    blit = np.asarray(chart.fig.canvas.buffer_rgba()).copy()
+    for line in chart.lines:
+        line.set_animated(False)
+    chart.fig.canvas.draw()
+    assert np.array_equal(blit, np.asarray(chart.fig.canvas.buffer_rgba()))
+
+
+def test_live_chart_dates():
+    chart = ppb_live.LiveChart(capacity=30)
+    start = np.datetime64('2024-01-01T00:00')
+    for i in range(40):
+        chart.append(start + np.timedelta64(i, 'm'), i)
+        chart.update()
+
+    x, _ = chart.data()
+    assert x.dtype.kind == 'M'
+    assert isinstance(chart.ax.xaxis.get_major_formatter(), 
+                      (mdates.AutoDateFormatter, mdates.ConciseDateFormatter))
+    x0, x1 = chart.ax.get_xlim()
+    assert x0 <= mdates.date2num(x[0]) and mdates.date2num(x[-1]) <= x1
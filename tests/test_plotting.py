@@ -0,0 +1,19 @@
+import matplotlib.pyplot as plt
+import pytest
+
+import pyplotbrookings.pyplotbrookings as ppb
+from pyplotbrookings.plotting import _Layout
+
+
+@pytest.mark.parametrize('dpi', [72, 100, 300])
+def test_get_coords_independent_of_dpi(dpi):
+    fig = plt.figure(figsize=(6, 4), dpi=dpi)
+    ax = fig.add_subplot()
+    ax.plot([1, 3, 2])
+    layout = _Layout(fig)
+
+    for loc in ('left', 'right', 'bottom', 'top'):
+        coords = ppb.get_coords(loc, fig=fig)
+        assert coords == pytest.approx(layout.coords(loc))
+        assert -0.5 < coords < 1.5
+        assert ppb.get_coords(loc, ax, fig=fig) == pytest.approx(layout.coords(loc, ax))
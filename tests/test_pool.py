@@ -0,0 +1,95 @@
+import io
+
+import numpy as np
+import pytest
+
+import pyplotbrookings.pyplotbrookings as ppb
+from pyplotbrookings.pool import FigurePool
+
+
+def state(fig):
+    '''
+    The figure state a borrower can change
+    '''
+    engine = fig.get_layout_engine()
+    return {
+        'layout': type(engine).__name__ if engine is not None else None,
+        'facecolor': fig.get_facecolor(),
+        'edgecolor': fig.get_edgecolor(),
+        'size': tuple(fig.get_size_inches()),
+        'dpi': fig.dpi,
+        'frameon': fig.get_frameon(),
+        'patch': (fig.patch.get_alpha(), fig.patch.get_linewidth()),
+        'subplotpars': vars(fig.subplotpars),
+        'artists': (fig.axes, fig.texts, fig.lines, fig.patches, fig.images, fig.legends),
+        'callbacks': sum(len(c) for c in fig.canvas.callbacks.callbacks.values()),
+        'figure_callbacks': (sum(len(c) for c in fig.callbacks.callbacks.values())
+                             if hasattr(fig, 'callbacks') else None),
+    }
+
+
+def test_released_figures_are_reset():
+    pool = FigurePool()
+    fresh = state(ppb.new_figure('medium'))
+
+    fig = pool.acquire('medium')
+    fig.subplots_adjust(left=0.3)
+    fig.set_layout_engine('constrained')
+    fig.set_facecolor('red')
+    fig.set_edgecolor('blue')
+    fig.set_size_inches(3, 3)
+    fig.set_frameon(False)
+    fig.patch.set_alpha(0.5)
+    fig.suptitle('Title')
+    fig.text(0.5, 0.5, 'Text')
+    fig.add_subplot().plot([1, 2])
+    fig.canvas.mpl_connect('draw_event', lambda event: None)
+    if hasattr(fig, 'callbacks'):
+        fig.callbacks.connect('dpi_changed', lambda fig: None)
+    pool.release(fig)
+
+    reused = pool.acquire('medium')
+    assert reused is fig
+    assert state(reused) == fresh
+
+
+def test_figures_are_released_once():
+    pool = FigurePool()
+    fig = pool.acquire('small')
+    pool.release(fig)
+    with pytest.raises(Exception):
+        pool.release(fig)
+
+    first, second = pool.acquire('small'), pool.acquire('small')
+    assert first is not second
+    assert pool.stats()['live'] == 2
+
+
+def test_pooled_figures_can_be_saved_several_times():
+    pool = FigurePool()
+    fig = pool.acquire('medium')
+    fig.add_subplot().plot([1, 3, 2])
+    first, second = io.BytesIO(), io.BytesIO()
+
+    ppb.save(first, fig=fig, format='png')
+    ppb.save(second, fig=fig, format='png', close=True)
+
+    assert first.getvalue() == second.getvalue()
+    assert pool.stats()['live'] == 0
+
+
+def test_reused_figures_render_like_new_ones():
+    pool = FigurePool()
+
+    def render(fig):
+        fig.add_subplot().plot(np.arange(10) ** 2)
+        buffer = io.BytesIO()
+        ppb.save(buffer, fig=fig, format='png')
+        return buffer.getvalue()
+
+    expected = render(ppb.new_figure('medium'))
+    fig = pool.acquire('medium')
+    fig.set_layout_engine('constrained')
+    render(fig)
+    pool.release(fig)
+    assert render(pool.acquire('medium')) == expected
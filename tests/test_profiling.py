@@ -0,0 +1,36 @@
+import json
+
+import pyplotbrookings.pyplotbrookings as ppb
+import pyplotbrookings.profiling as ppb_profiling
+
+
+def test_record_phases(tmp_path):
+    events = []
+    ppb_profiling.enable(events.append)
+    try:
+        with ppb_profiling.record() as recorder:
+            fig = ppb.new_figure('small')
+            fig.add_subplot().plot([1, 2, 3])
+            ppb.add_title('Title', fig=fig)
+            ppb.save(str(tmp_path / 'chart.png'), fig=fig, dpi='screen')
+    finally:
+        ppb_profiling.disable(events.append)
+
+    assert events == recorder.events
+    totals = recorder.totals(fig)
+    assert sum(total['draws'] for total in totals.values()) >= 1
+    assert 'phase' in recorder.summary(fig)
+
+    recorder.to_json(str(tmp_path / 'events.jsonl'))
+    with open(tmp_path / 'events.jsonl') as file:
+        assert [json.loads(line) for line in file] == recorder.events
+
+
+def test_no_events_when_off():
+    assert not ppb_profiling._recorders and not ppb_profiling._listeners
+    with ppb_profiling.record() as recorder:
+        pass
+    fig = ppb.new_figure('small')
+    with ppb_profiling.phase('test', fig):
+        pass
+    assert recorder.events == []
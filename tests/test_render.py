@@ -0,0 +1,26 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pyplotbrookings.render as ppb_render
+
+
+def plot(ax):
+    ax.plot([1, 3, 2])
+
+
+def test_render_chart_threads_match():
+    expected = ppb_render.render_chart(plot, title='Title', notes=['Source: x'])
+    assert expected.startswith(b'\x89PNG')
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: ppb_render.render_chart(plot, title='Title', notes=['Source: x']), 
+                                range(8)))
+    assert all(result == expected for result in results)
+
+
+def test_render_async():
+    async def main():
+        return await asyncio.gather(*(ppb_render.render(plot, format='svg') for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert len(results) == 3 and all(b'<svg' in result for result in results)
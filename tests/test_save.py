@@ -0,0 +1,71 @@
+import io
+import re
+
+import numpy as np
+from PIL import Image
+
+import pyplotbrookings.pyplotbrookings as ppb
+
+
+def chart():
+    fig = ppb.new_figure('medium')
+    fig.add_subplot().plot([1, 3, 2])
+    ppb.add_title('Unemployment rose sharply in the spring of the pandemic year 2020',
+                  subtitle='Monthly rate, percent', fig=fig)
+    ppb.add_notes('Source: Bureau of Labor Statistics', fig=fig)
+    return fig
+
+
+def pixels(data):
+    return np.asarray(Image.open(io.BytesIO(data)).convert('RGBA'))
+
+
+def test_save_all_matches_save():
+    ppb.set_theme()
+    fig = chart()
+    outputs = ppb.save_all(None, formats=('png', 'jpg', 'svg'), dpi=('screen', 'print', 100), fig=fig)
+
+    for dpi in ('screen', 'print', 100):
+        buffer = io.BytesIO()
+        ppb.save(buffer, dpi=dpi, fig=fig, format='png')
+        assert np.array_equal(pixels(outputs[('png', dpi)]), pixels(buffer.getvalue()))
+        assert pixels(outputs[('jpg', dpi)]).shape == pixels(buffer.getvalue()).shape
+
+    assert outputs[('svg', 'print')].startswith(b'<?xml')
+
+
+def test_save_all_shares_draws_of_the_same_dpi():
+    fig = chart()
+    outputs = ppb.save_all(None, formats=('png',), dpi=('retina', 320), fig=fig)
+    assert outputs[('png', 'retina')] == outputs[('png', 320)]
+
+
+
+def test_compact_svg_is_smaller_and_consistent():
+    fig = chart()
+    plain, compact = io.BytesIO(), io.BytesIO()
+    ppb.save(plain, fig=fig, format='svg')
+    size = ppb.save(compact, fig=fig, format='svg', compact=True)
+
+    assert size == len(compact.getvalue()) < len(plain.getvalue())
+    svg = compact.getvalue().decode()
+    header = svg[svg.index('<svg'):]
+    header = header[:header.index('>')]
+    width = header.split(' width="')[1].split('pt"')[0]
+    height = header.split(' height="')[1].split('pt"')[0]
+    assert f'viewBox="0 0 {width} {height}"' in header
+
+
+def test_report_keeps_parameters_changed_while_open():
+    import matplotlib as mpl
+
+    ppb.set_theme(font_size=12)
+    buffer = io.BytesIO()
+    with ppb.Report(buffer) as report:
+        report.add(chart())
+        ppb.set_theme(font_size=16)
+        report.add(chart())
+
+    assert mpl.rcParams['font.size'] == 16
+    assert report.size == len(buffer.getvalue()) > 0
+    assert len(re.findall(rb'/Type\s*/Page\b', buffer.getvalue())) == 2
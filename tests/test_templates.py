@@ -0,0 +1,68 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import pyplotbrookings.pyplotbrookings as ppb
+import pyplotbrookings.templates as ppb_templates
+
+x = np.linspace(0, 10, 200)
+chrome = dict(title='Unemployment rate by state', subtitle='Percent', notes=['Source: BLS'])
+
+
+def plot_lines(ax):
+    ax.fill_between(x, 0, 1 + np.sin(x) ** 2, alpha=0.5)
+    ax.plot(x, np.sin(x) * 3 + 5)
+    # Above the spines
+    ax.plot(x, np.cos(x) * 5 + 5, zorder=3)
+
+
+def plot_grid(axes):
+    for k, ax in enumerate(axes.flat):
+        ax.plot(x, np.sin(x + k) * 5 + 5, linewidth=3)
+    axes.flat[0].figure.legend(['data'], loc='center')
+
+
+def setup(axes):
+    for ax in np.atleast_1d(axes).flat:
+        ax.set_xlabel('Year')
+        ax.axhline(5, color='black', zorder=2.2)
+
+
+def full_render(plot, **kwargs):
+    fig = ppb.new_figure('medium')
+    axes = fig.subplots(squeeze=False, **kwargs)
+    axes = axes[0, 0] if axes.size == 1 else axes
+    for ax in np.atleast_1d(axes).flat:
+        ax.set_xlim(0, 10)
+        ax.set_ylim(0, 10)
+    setup(axes)
+    plot(axes)
+    ppb.add_chrome(**chrome, dpi='screen', fig=fig)
+    buffer = io.BytesIO()
+    ppb.save(buffer, dpi='screen', fig=fig, format='png')
+    return np.asarray(Image.open(buffer).convert('RGBA')).astype(int)
+
+
+@pytest.mark.parametrize('plot, kwargs', [(plot_lines, {}), 
+                                          (plot_grid, dict(nrows=2, ncols=2, sharey=True))])
+def test_template_matches_full_render(plot, kwargs):
+    ppb.set_theme(background_color='white')
+    template = ppb_templates.FigureTemplate(xlim=(0, 10), ylim=(0, 10), setup=setup, 
+                                            **chrome, **kwargs)
+
+    expected = full_render(plot, **kwargs)
+    for _ in range(2):
+        image = template.render_rgba(plot).astype(int)
+        assert image.shape == expected.shape
+        assert np.abs(image - expected).max() <= 3
+
+
+def test_template_clears_data():
+    template = ppb_templates.FigureTemplate(xlim=(0, 10), ylim=(0, 10), **chrome)
+    empty = template.render_rgba(lambda ax: None)
+
+    template.render_rgba(plot_lines)
+    assert np.array_equal(template.render_rgba(lambda ax: None), empty)
+    assert np.array_equal(empty, template.background)
@@ -0,0 +1,52 @@
+import pytest
+
+import pyplotbrookings.pyplotbrookings as ppb
+import pyplotbrookings.text as ppb_text
+
+TITLE = ('Unemployment rose sharply in the spring of the pandemic year 2020 across all '
+         'states and metro areas, hitting Nevada hardest of all')
+SUBTITLE = ('Monthly unemployment rate by state, seasonally adjusted, percent of the labor '
+            'force aged sixteen and over, with recessions shaded')
+NOTE = ('Source: Bureau of Labor Statistics, Current Population Survey, monthly data '
+        'through December 2020, with author calculations and more')
+
+
+def test_wrap_text_breaks_between_words():
+    text = ppb_text.wrap_text('one two three four five six', 60, size=12)
+    assert text.replace('\n', ' ') == 'one two three four five six'
+    assert all(ppb_text.text_width(line, size=12) <= 60 for line in text.splitlines())
+
+
+def test_wrap_text_keeps_line_breaks_and_long_words():
+    assert ppb_text.wrap_text('a\nb', 1000, size=12) == 'a\nb'
+    assert ppb_text.wrap_text('supercalifragilistic', 10, size=12) == 'supercalifragilistic'
+
+
+def test_wrap_text_indent():
+    line = 'one two three'
+    width = ppb_text.text_width(line, size=12)
+    assert ppb_text.wrap_text(line, width + 1, size=12) == line
+    assert '\n' in ppb_text.wrap_text(line, width + 1, size=12, indent=20)
+
+
+def test_widest_metrics():
+    dpis = (None, 72, 300)
+    widths = [ppb_text.text_width('Unemployment rate', 12, 'bold', dpi=dpi) for dpi in dpis]
+    assert ppb_text.text_width('Unemployment rate', 12, 'bold', dpi=dpis) == max(widths)
+
+
+@pytest.mark.parametrize('family', ['Inter', 'Roboto', 'Helvetica'])
+def test_wrapped_titles_and_notes_fit_the_figure(family):
+    ppb.set_theme(font_family=family)
+    for size in ('small', 'medium', 'large'):
+        fig = ppb.new_figure(size)
+        fig.add_subplot().plot([1, 2])
+        ppb.add_title(TITLE, subtitle=SUBTITLE, fig=fig)
+        ppb.add_notes(NOTE, 'Note: ' + SUBTITLE, fig=fig)
+
+        for dpi in (72, 96, 100, 150, 200, 300, 320):
+            fig.set_dpi(dpi)
+            fig.canvas.draw()
+            renderer = fig.canvas.get_renderer()
+            for text in fig.texts:
+                assert text.get_window_extent(renderer).x1 <= fig.bbox.x1, (size, dpi, text.get_text())
@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import matplotlib as mpl
+
+import pyplotbrookings.pyplotbrookings as ppb
+from pyplotbrookings.theme import Theme
+
+
+def test_set_theme_keeps_the_backend():
+    ppb.set_theme()
+    backend = mpl.rcParams['backend']
+    mpl.rcParams['backend'] = 'pdf'
+    try:
+        ppb.set_theme()
+        assert mpl.rcParams['backend'] == 'pdf'
+    finally:
+        mpl.rcParams['backend'] = backend
+
+
+def test_theme_block_restores_parameters():
+    ppb.set_theme(font_size=12)
+    with Theme(font_size=20):
+        assert mpl.rcParams['font.size'] == 20
+    assert mpl.rcParams['font.size'] == 12
+
+
+def test_theme_block_does_not_block_other_threads():
+    done = []
+
+    def other():
+        ppb.set_theme(font_size=14)
+        done.append(time.perf_counter())
+
+    with Theme(font_size=20):
+        start = time.perf_counter()
+        thread = threading.Thread(target=other)
+        thread.start()
+        thread.join(timeout=5)
+        assert done and done[0] - start < 0.2
+
+
+def test_exported_style_works_without_the_package(tmp_path):
+    path = str(tmp_path / 'brookings.mplstyle')
+    Theme(background_color='white').export(path)
+
+    script = f'''
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import sys
+plt.style.use({path!r})
+plt.imshow([[1, 2], [3, 4]])
+plt.savefig({str(tmp_path / 'out.png')!r})
+assert 'pyplotbrookings' not in sys.modules
+'''
+    env = dict(os.environ, PYTHONPATH='')
+    subprocess.run([sys.executable, '-c', script], check=True, env=env, cwd=str(tmp_path))
+    assert os.path.exists(tmp_path / 'out.png')